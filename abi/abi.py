@@ -1,12 +1,21 @@
-"""Abi for tokens"""
+"""Abi for tokens. Every ABI file is parsed on first access of its name"""
 import json
 import os
 
-with open(os.path.join(os.path.abspath(os.path.join(__file__, os.path.pardir)), 'router_abi.json')) as file:
-    stargate_abi = json.load(file)
-with open(os.path.join(os.path.abspath(os.path.join(__file__, os.path.pardir)), 'usdc_abi.json')) as file:
-    usdc_abi = json.load(file)
-with open(os.path.join(os.path.abspath(os.path.join(__file__, os.path.pardir)), 'usdt_abi.json')) as file:
-    usdt_abi = json.load(file)
-with open(os.path.join(os.path.abspath(os.path.join(__file__, os.path.pardir)), 'bungee_refuel_abi.json')) as file:
-    bungee_refuel_abi = json.load(file)
+_ABI_FILES = {
+    "stargate_abi": "router_abi.json",
+    "usdc_abi": "usdc_abi.json",
+    "usdt_abi": "usdt_abi.json",
+    "bungee_refuel_abi": "bungee_refuel_abi.json",
+    "multicall3_abi": "multicall3_abi.json",
+}
+
+
+def __getattr__(name: str) -> list:
+    if name not in _ABI_FILES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    with open(os.path.join(os.path.abspath(os.path.join(__file__, os.path.pardir)), _ABI_FILES[name])) as file:
+        abi = json.load(file)
+    globals()[name] = abi  # later accesses do not reach __getattr__
+    return abi
@@ -0,0 +1,225 @@
+"""Offline load benchmark of bridging flows against the local mock JSON-RPC server.
+
+Every scenario runs for 10, 100 and 1,000 wallets in a fresh interpreter with deterministic private keys,
+zero start and cycle delays and all chains pointed at one mock server running in its own process.
+Reported are wall time, HTTP requests and JSON-RPC calls per second, peak memory and successful wallets.
+Exits with code 1 if a run exceeds its wall time budget or a wallet fails without injected errors.
+
+Scenarios:
+    balance:    balance checker of all supported chains
+    one-way:    polygon-avalanche bridging of every wallet
+    default:    one transfer cycle polygon -> avalanche -> bsc -> polygon of every wallet
+
+Usage:
+    python benchmarks/bench.py [--wallets 10 100 1000] [--latency 20] [--error-rate 0] [--rps 0]
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from prettytable import PrettyTable
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+
+SCENARIOS = ["balance", "one-way", "default"]
+
+# Wall time budget in seconds of a scenario per wallet, measured with the default mock latency
+BUDGET_PER_WALLET = {"balance": 0.005, "one-way": 0.02, "default": 0.06}
+BUDGET_BASE = 5  # Seconds added to every budget for fixed per run overhead
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_mock(latency: float, error_rate: float) -> tuple[subprocess.Popen, int]:
+    """Start the mock server in its own process, so it does not share CPU with the measured client"""
+    port = _free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(ROOT, "benchmarks", "mock_rpc.py"),
+            f"--port={port}",
+            f"--latency={latency}",
+            f"--error-rate={error_rate}",
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process, port
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Mock JSON-RPC server did not start")
+
+
+def _private_keys(wallets: int) -> list[str]:
+    return [f"0x{i:064x}" for i in range(1, wallets + 1)]
+
+
+async def _run_child(scenario: str, wallets: int, port: int, rps: float, work_dir: str) -> dict:
+    """Run a scenario in this process against the mock server at port and get its stats"""
+    sys.path.insert(0, ROOT)
+
+    import config
+
+    # Config is patched before the modules are imported, as they copy config values at import time
+    config.PRIVATE_KEYS[:] = _private_keys(wallets)
+    config.TIMES = 1
+    config.START_DELAY_MIN = config.START_DELAY_MAX = 0
+    config.JOURNAL_PATH = os.path.join(work_dir, "journal.jsonl")
+    config.TRACE_PATH = os.path.join(work_dir, "traces.jsonl")
+    if rps:
+        config.RPC_REQUESTS_PER_SECOND = rps
+    else:
+        config.RPC_MAX_IN_FLIGHT, config.RPC_REQUESTS_PER_SECOND = 10**6, 10**9
+
+    from modules.chains import all_chains
+    from modules.custom_logger import logger
+
+    logger.remove()
+    for chain in all_chains:  # chain providers are built on first use, so they pick the mock endpoints up
+        chain.rpc_urls = [f"http://127.0.0.1:{port}/{chain.name.lower()}"]
+
+    from modules import metrics
+    from modules.http_session import session_manager
+    from modules.price_oracle import price_oracle
+    from modules.signer import signer
+
+    price_oracle.base_url = f"http://127.0.0.1:{port}"
+
+    started = time.monotonic()
+    await signer.load(config.PRIVATE_KEYS)
+    try:
+        match scenario:
+            case "balance":
+                from modules.balance_checker import get_balances
+
+                try:
+                    await get_balances()
+                    succeeded = wallets
+                except Exception:  # a failed call fails the whole balance table
+                    succeeded = 0
+            case "one-way":
+                from modules.chain_to_chain import bridge_route
+                from modules.routes import stargate_routes
+
+                results = await asyncio.gather(
+                    *[bridge_route(wallet=wallet, route=stargate_routes["pa"]) for wallet in config.PRIVATE_KEYS],
+                    return_exceptions=True,
+                )
+                succeeded = sum(isinstance(result, str) for result in results)
+            case "default":
+                from modules import core_script
+                from modules.journal import FINISHED, journal
+
+                core_script.CYCLE_LEGS[:] = [(route, (0, 0)) for route, _ in core_script.CYCLE_LEGS]
+                await core_script.main()
+                succeeded = sum(state["state"] == FINISHED for state in journal.load().values())
+    finally:
+        wall_time = time.monotonic() - started
+        await session_manager.close()
+        signer.close()
+
+    return {
+        "wall_time": wall_time,
+        "http_requests": sum(series.count for series in metrics.http_latency.series.values()),
+        "rpc_calls": sum(series.count for series in metrics.rpc_latency.series.values()),
+        "peak_memory_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # ru_maxrss is in KiB on Linux
+        "succeeded": succeeded,
+    }
+
+
+def _child_main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as work_dir:
+        result = asyncio.run(_run_child(args.scenario, args.child_wallets, args.port, args.rps, work_dir))
+    with open(args.result, "w") as file:
+        json.dump(result, file)
+
+
+def _run_scenario(scenario: str, wallets: int, port: int, rps: float) -> dict:
+    """Run a scenario in a fresh interpreter, so imports, caches and peak memory are not shared between runs"""
+    with tempfile.NamedTemporaryFile(suffix=".json") as result:
+        subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                f"--scenario={scenario}",
+                f"--child-wallets={wallets}",
+                f"--port={port}",
+                f"--rps={rps}",
+                f"--result={result.name}",
+            ],
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        return json.load(result)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline bridging load benchmark")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS, help="Scenarios to run")
+    parser.add_argument("--wallets", nargs="+", type=int, default=[10, 100, 1000], help="Wallet counts to run")
+    parser.add_argument("--latency", type=float, default=20, help="Mock response latency in milliseconds")
+    parser.add_argument("--error-rate", type=float, default=0, help="Share of mock calls answered with an error")
+    parser.add_argument("--rps", type=float, default=0, help="Requests per second limit per chain, 0 is unlimited")
+    # Internal arguments of a scenario run in a child interpreter
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    parser.add_argument("--child-wallets", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        _child_main(args)
+        return
+
+    mock, port = _start_mock(latency=args.latency, error_rate=args.error_rate)
+    failed = []
+
+    table = PrettyTable()
+    table.field_names = ["Scenario", "Wallets", "Wall s", "HTTP req/s", "RPC calls/s", "Peak MB", "Succeeded", "Budget s"]
+    try:
+        for scenario in args.scenarios:
+            for wallets in args.wallets:
+                result = _run_scenario(scenario, wallets, port, args.rps)
+                budget = BUDGET_BASE + BUDGET_PER_WALLET[scenario] * wallets
+                table.add_row(
+                    [
+                        scenario,
+                        wallets,
+                        round(result["wall_time"], 2),
+                        round(result["http_requests"] / result["wall_time"]),
+                        round(result["rpc_calls"] / result["wall_time"]),
+                        round(result["peak_memory_mb"]),
+                        f"{result['succeeded']}/{wallets}",
+                        budget,
+                    ]
+                )
+                if result["wall_time"] > budget or (not args.error_rate and result["succeeded"] < wallets):
+                    failed.append(f"{scenario} x{wallets}")
+    finally:
+        mock.terminate()
+        mock.wait()
+
+    print(table)
+    if failed:
+        print(f"Failed or over budget: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Cold start import time of every CLI mode.
+
+Every mode is measured in fresh interpreters as the median wall time of importing main.py
+and the modules the mode imports, minus the bare interpreter start.
+Chains build their web3 instances and contracts on first use, so after the imports no chain may have one.
+Exits with code 1 if a mode exceeds its budget or an import builds a chain web3 instance.
+
+Usage:
+    python benchmarks/import_time.py [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+
+# Modules imported by each mode of main.py and the mode import budget in milliseconds
+MODES = {
+    "new-wallet": (["modules.wallet_generator"], 1200),
+    "balance": (["modules.http_session", "modules.signer", "modules.balance_checker"], 2000),
+    "refuel": (["modules.http_session", "modules.signer", "modules.bungee_refuel"], 2000),
+    "one-way": (["modules.http_session", "modules.signer", "modules.fee_quotes", "modules.chain_to_chain"], 2000),
+    "default": (
+        [
+            "modules.http_session",
+            "modules.signer",
+            "modules.fee_quotes",
+            "modules.balance_checker",
+            "modules.core_script",
+        ],
+        2000,
+    ),
+}
+
+
+def _run(code: str, runs: int) -> float:
+    """Median wall time of running code in fresh interpreters, in milliseconds"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def _eager_chains(imports: str) -> list[str]:
+    """Names of chains whose web3 instance is built by the imports"""
+    code = f"{imports}; from modules.chains import all_chains; print(*[c.name for c in all_chains if 'w3' in vars(c)])"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True)
+    return result.stdout.split()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CLI modes cold start benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs per mode")
+    args = parser.parse_args()
+
+    interpreter = _run("pass", args.runs)
+    over_budget = []
+    eager = []
+
+    print(f"{'mode':<12}{'import ms':>12}{'budget ms':>12}  eager chains")
+    for mode, (modules, budget) in MODES.items():
+        imports = "; ".join(["import main"] + [f"import {module}" for module in modules])
+        elapsed = _run(imports, args.runs) - interpreter
+        chains = _eager_chains(imports)
+        print(f"{mode:<12}{elapsed:>12.0f}{budget:>12}  {', '.join(chains) or '-'}")
+        if elapsed > budget:
+            over_budget.append(mode)
+        if chains:
+            eager.append(mode)
+
+    if over_budget:
+        print(f"Over budget: {', '.join(over_budget)}")
+    if eager:
+        print(f"Chain web3 instances built on import: {', '.join(eager)}")
+    if over_budget or eager:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Local mock JSON-RPC server emulating the chain calls the bridger makes.
+
+Emulated:
+    eth_call:   balanceOf, decimals, symbol, allowance, quoteLayerZeroFee and Multicall3 aggregate3
+    eth_chainId, eth_blockNumber, eth_gasPrice, eth_getTransactionCount, eth_getBalance, eth_estimateGas,
+    eth_sendRawTransaction and eth_getTransactionReceipt of sent transactions
+    GET /data/pricemulti of the price API
+Batch requests are supported. Latency and error rate are configurable.
+
+Usage:
+    python benchmarks/mock_rpc.py [--port 8545] [--latency 50] [--error-rate 0.01]
+"""
+import argparse
+import asyncio
+import random
+
+from aiohttp import web
+from eth_abi import decode, encode
+from eth_utils import function_signature_to_4byte_selector, keccak
+
+_SELECTORS = {
+    function_signature_to_4byte_selector(signature): name
+    for signature, name in [
+        ("balanceOf(address)", "balanceOf"),
+        ("decimals()", "decimals"),
+        ("symbol()", "symbol"),
+        ("allowance(address,address)", "allowance"),
+        ("quoteLayerZeroFee(uint16,uint8,bytes,bytes,(uint256,uint256,bytes))", "quoteLayerZeroFee"),
+        ("aggregate3((address,bool,bytes)[])", "aggregate3"),
+    ]
+}
+
+
+class MockRpcServer:
+    """Mock chain node. Every wallet has the same token balance, allowance and native balance
+
+    Args:
+        port:           port to listen on, 0 picks a free one
+        latency:        seconds to wait before answering an HTTP request
+        error_rate:     share of JSON-RPC calls answered with an error
+        token_balance:  raw token balance of every wallet, enough for both 6 and 18 decimals tokens
+        allowance:      raw router allowance of every wallet
+    """
+
+    def __init__(
+        self,
+        port: int = 0,
+        latency: float = 0,
+        error_rate: float = 0,
+        token_balance: int = 10**24,
+        allowance: int = 10**30,
+    ):
+        self.port = port
+        self.latency = latency
+        self.error_rate = error_rate
+        self.token_balance = token_balance
+        self.allowance = allowance
+        self.block_number = 1_000_000
+        self.http_requests = 0
+        self.calls = 0
+        self._sent: set[str] = set()
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/"
+
+    def _eth_call(self, data: bytes) -> bytes:
+        function = _SELECTORS.get(data[:4])
+        if function == "balanceOf":
+            return encode(["uint256"], [self.token_balance])
+        if function == "decimals":
+            return encode(["uint8"], [6])
+        if function == "symbol":
+            return encode(["string"], ["USDC"])
+        if function == "allowance":
+            return encode(["uint256"], [self.allowance])
+        if function == "quoteLayerZeroFee":
+            return encode(["uint256", "uint256"], [10**15, 0])
+        if function == "aggregate3":
+            (calls,) = decode(["(address,bool,bytes)[]"], data[4:])
+            return encode(["(bool,bytes)[]"], [[(True, self._eth_call(call_data)) for _, _, call_data in calls]])
+        raise ValueError(f"Unknown selector 0x{data[:4].hex()}")
+
+    def _receipt(self, transaction_hash: str) -> dict | None:
+        if transaction_hash not in self._sent:
+            return None
+        return {
+            "status": "0x1",
+            "transactionHash": transaction_hash,
+            "transactionIndex": "0x0",
+            "blockNumber": hex(self.block_number),
+            "blockHash": "0x" + "00" * 32,
+            "from": "0x" + "00" * 20,
+            "to": "0x" + "00" * 20,
+            "contractAddress": None,
+            "logs": [],
+            "logsBloom": "0x" + "00" * 256,
+            "gasUsed": hex(100_000),
+            "cumulativeGasUsed": hex(100_000),
+            "effectiveGasPrice": hex(30 * 10**9),
+            "type": "0x0",
+        }
+
+    def _handle_call(self, request: dict) -> dict:
+        self.calls += 1
+        method, params = request["method"], request.get("params", [])
+
+        if random.random() < self.error_rate:
+            return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32000, "message": "mock error"}}
+
+        if method == "eth_call":
+            result = "0x" + self._eth_call(bytes.fromhex(params[0]["data"][2:])).hex()
+        elif method == "eth_chainId":
+            result = "0x89"
+        elif method == "eth_blockNumber":
+            self.block_number += 1
+            result = hex(self.block_number)
+        elif method == "eth_gasPrice":
+            result = hex(30 * 10**9)
+        elif method == "eth_getTransactionCount":
+            result = "0x0"
+        elif method == "eth_getBalance":
+            result = hex(10**20)
+        elif method == "eth_estimateGas":
+            result = hex(100_000)
+        elif method == "eth_sendRawTransaction":
+            result = "0x" + keccak(hexstr=params[0]).hex()
+            self._sent.add(result)
+        elif method == "eth_getTransactionReceipt":
+            result = self._receipt(params[0])
+        else:
+            return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32601, "message": f"{method} not found"}}
+
+        return {"jsonrpc": "2.0", "id": request["id"], "result": result}
+
+    async def _handle_rpc(self, request: web.Request) -> web.Response:
+        self.http_requests += 1
+        body = await request.json()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if isinstance(body, list):
+            return web.json_response([self._handle_call(call) for call in body])
+        return web.json_response(self._handle_call(body))
+
+    async def _handle_head(self, request: web.Request) -> web.Response:
+        return web.Response()
+
+    async def _handle_prices(self, request: web.Request) -> web.Response:
+        self.http_requests += 1
+        return web.json_response({symbol: {"USDT": 1.0} for symbol in request.query["fsyms"].split(",")})
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/data/pricemulti", self._handle_prices)
+        # Any path is an endpoint, so every chain can get its own endpoint URI, e.g. http://127.0.0.1:8545/polygon
+        app.router.add_post("/{chain:.*}", self._handle_rpc)
+        app.router.add_route("HEAD", "/{chain:.*}", self._handle_head)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+async def _serve(port: int, latency: float, error_rate: float) -> None:
+    server = MockRpcServer(port=port, latency=latency, error_rate=error_rate)
+    await server.start()
+    print(f"Mock JSON-RPC server is listening on {server.url}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock JSON-RPC server")
+    parser.add_argument("--port", type=int, default=8545, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0, help="Response latency in milliseconds")
+    parser.add_argument("--error-rate", type=float, default=0, help="Share of calls answered with an error")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_serve(port=args.port, latency=args.latency / 1000, error_rate=args.error_rate))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,74 @@
+"""Latency routing check of the RPC pool provider against a slow and a fast local mock JSON-RPC server.
+
+Reads are hedged after a budget shorter than the fast endpoint latency, so the slow endpoint is hedged to
+and cancelled on every read it gets. It has to end up ranked behind the fast one and stay there.
+Exits with code 1 if the slow endpoint is ranked first after the warm-up reads.
+
+Usage:
+    python benchmarks/pool_routing.py [--reads 20] [--slow 1000] [--fast 150] [--hedge-after 100]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+from web3.types import RPCEndpoint
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+sys.path.insert(0, ROOT)
+
+from benchmarks.mock_rpc import MockRpcServer  # noqa: E402
+from modules.custom_logger import logger  # noqa: E402
+from modules.http_session import session_manager  # noqa: E402
+from modules.providers import RpcPoolProvider  # noqa: E402
+
+WARM_UP_READS = 3  # Reads the pool takes to measure both endpoints
+
+
+async def _check(reads: int, slow: float, fast: float, hedge_after: float) -> list[int]:
+    """Run sequential reads and get the numbers of reads after which the slow endpoint is ranked first"""
+    slow_server, fast_server = MockRpcServer(latency=slow), MockRpcServer(latency=fast)
+    await slow_server.start()
+    await fast_server.start()
+    pool = RpcPoolProvider([slow_server.url, fast_server.url], name="routing", hedge_after=hedge_after)
+    slow_endpoint, fast_endpoint = pool.endpoints
+
+    misrouted = []
+    try:
+        for read in range(1, reads + 1):
+            await pool.make_request(RPCEndpoint("eth_blockNumber"), [])
+            ranked_first = pool._healthy()[0]
+            print(
+                f"read {read:>3}  slow EWMA {slow_endpoint.latency or 0:>6.3f} s  "
+                f"fast EWMA {fast_endpoint.latency or 0:>6.3f} s  "
+                f"first {'slow' if ranked_first is slow_endpoint else 'fast'}"
+            )
+            if read > WARM_UP_READS and ranked_first is slow_endpoint:
+                misrouted.append(read)
+    finally:
+        await session_manager.close()
+        await slow_server.stop()
+        await fast_server.stop()
+
+    return misrouted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="RPC pool latency routing check")
+    parser.add_argument("--reads", type=int, default=20, help="Number of sequential reads")
+    parser.add_argument("--slow", type=float, default=1000, help="Slow endpoint latency in milliseconds")
+    parser.add_argument("--fast", type=float, default=150, help="Fast endpoint latency in milliseconds")
+    parser.add_argument("--hedge-after", type=float, default=100, help="Hedge budget in milliseconds")
+    args = parser.parse_args()
+
+    logger.remove()
+    misrouted = asyncio.run(
+        _check(reads=args.reads, slow=args.slow / 1000, fast=args.fast / 1000, hedge_after=args.hedge_after / 1000)
+    )
+    if misrouted:
+        print(f"Slow endpoint is ranked first after reads: {', '.join(map(str, misrouted))}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
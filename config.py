@@ -9,7 +9,63 @@ TIMES = 1  # Number of runs
 
 AMOUNT_TO_SWAP = random.randint(AMOUNT_MIN, AMOUNT_MAX)  # Bridge Quantity Randomization
 
+START_DELAY_MIN = 1  # Min random delay in seconds before a wallet starts a bridge leg
+START_DELAY_MAX = 200  # Max random delay in seconds before a wallet starts a bridge leg
+
 private_keys = dotenv_values("private_keys.env")
 PRIVATE_KEYS = [key for key in private_keys.values()]
 
 BUNGEE_AMOUNT = 4.5  # $ value of native asset to be bridged via Bungee Refuel
+
+SIGNER_MAX_WORKERS = 4  # Number of workers deriving accounts and signing transactions
+SIGNER_USE_PROCESSES = False  # Sign in worker processes instead of threads
+
+MULTICALL_BATCH_SIZE = 500  # Max number of calls packed into one Multicall3 aggregate3 request
+RPC_BATCH_MAX_SIZE = 50  # Max number of JSON-RPC requests sent in one batch request
+
+RPC_MAX_IN_FLIGHT = 10  # Max number of simultaneous HTTP requests to one RPC endpoint
+RPC_REQUESTS_PER_SECOND = 25  # Max number of JSON-RPC calls per second to one RPC endpoint, batch calls included
+# Per endpoint (max in-flight, requests per second) overrides, e.g. {"https://rpc.ankr.com/optimism": (5, 10)}
+RPC_ENDPOINT_LIMITS: dict[str, tuple[int, float]] = {}
+RPC_RATE_LIMIT_RETRIES = 5  # Number of retries of a request answered with HTTP 429 Too Many Requests
+
+RPC_LATENCY_EWMA_ALPHA = 0.3  # Weight of the latest request latency in the endpoint latency average
+RPC_HEDGE_AFTER = 2.0  # Seconds to wait for a read before sending it to the next best endpoint too, None disables
+RPC_EJECT_AFTER_FAILURES = 3  # Number of consecutive failed requests after which an endpoint is ejected
+RPC_EJECT_SECONDS = 30  # Seconds before an ejected endpoint is probed, doubled after every failed probe
+RPC_EJECT_MAX_SECONDS = 600  # Max seconds between probes of an ejected endpoint
+
+METRICS_PORT = None  # Port of the local Prometheus /metrics endpoint, e.g. 9100. None disables it
+
+DASHBOARD_REFRESH_SECONDS = 1  # Seconds between redraws of the wallets progress dashboard
+DASHBOARD_ROWS = 10  # Max number of wallets listed in the progress dashboard
+
+SCHEDULER_WORKERS = 100  # Max number of wallet legs the default mode bridges at once
+
+HTTP_POOL_LIMIT = 100  # Max number of open connections in the shared HTTP session
+HTTP_POOL_LIMIT_PER_HOST = 20  # Max number of open connections to one host
+HTTP_KEEPALIVE_TIMEOUT = 60  # Seconds to keep an idle connection open
+HTTP_DNS_CACHE_TTL = 300  # Seconds to cache resolved host names
+HTTP_TIMEOUT = 30  # Total timeout of one HTTP request in seconds
+
+# Send the swap right after the approval is accepted by the node instead of waiting for the approval receipt
+PIPELINE_APPROVE_SWAP = True
+
+BLOCK_POLL_INTERVAL = 3  # Seconds between new block checks while wallets are waiting for a balance
+BALANCE_WAIT_TIMEOUT = 3600  # Max seconds to wait for tokens of a previous leg to arrive before the leg fails
+
+BUNGEE_API_URL = "https://refuel.socket.tech"  # Bungee Refuel API, can point to a local stub server
+BUNGEE_CACHE_TTL = 300  # Seconds to reuse the fetched Bungee Refuel chain limits
+
+PRICE_API_URL = "https://min-api.cryptocompare.com"  # Token price API
+PRICE_CACHE_TTL = 60  # Seconds to reuse fetched token prices
+PRICE_MAX_STALENESS = 600  # Max age in seconds of a cached price served when the price API is unavailable
+
+GAS_PRICE_MAX_AGE = 10  # Seconds to reuse a chain gas price when new blocks are not being followed
+
+FEE_QUOTE_TTL = 120  # Seconds to reuse a quoted LayerZero fee
+FEE_QUOTE_MAX_BLOCKS = 20  # Max number of blocks to reuse a quoted LayerZero fee while new blocks are followed
+
+TRACE_PATH = "run_traces.jsonl"  # JSON lines file of bridge leg stage spans used by --report, None disables tracing
+
+JOURNAL_PATH = "run_journal.jsonl"  # Append-only journal of the default mode progress used by --resume
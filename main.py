@@ -2,12 +2,7 @@
 import argparse
 import asyncio
 
-from modules.balance_checker import get_balances as balance_checker
-from modules.bungee_refuel import main as bungee_refuel
-from modules.chain_to_chain import main as chain_to_chain
-from modules.core_script import main as core_script
 from modules.custom_logger import logger
-from modules.wallet_generator import create_wallet as wallet_generator
 
 
 async def main():
@@ -21,6 +16,7 @@ async def main():
     mode_mapping = {
         "refuel": "bungee_refuel",
         "one-way": "chain_to_chain",
+        "multi-hop": "multi_hop",
         "balance": "balance_checker",
         "new-wallet": "wallet_generator",
         "default": "core_script",
@@ -39,26 +35,125 @@ async def main():
         type=str,
         nargs='?',
         default=None,
-        help="Routing mode for one-way and Bungee Refuel operations"
+        help="Routing mode for one-way, multi-hop and Bungee Refuel operations"
+    )
+
+    parser.add_argument(
+        "--objective",
+        type=str,
+        choices=["cheapest", "fastest"],
+        default="cheapest",
+        help="Path objective for multi-hop operations"
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume the interrupted default mode run from the run journal"
+    )
+
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Print p50/p95/max timings of bridge leg stages from traced runs and exit"
+    )
+
+    parser.add_argument(
+        "--record",
+        type=str,
+        metavar="CASSETTE",
+        help="Record JSON-RPC and REST traffic of the run to a cassette file"
+    )
+
+    parser.add_argument(
+        "--replay",
+        type=str,
+        metavar="CASSETTE",
+        help="Replay JSON-RPC and REST traffic of the run from a cassette file with no network"
+    )
+
+    parser.add_argument(
+        "--replay-timing",
+        action="store_true",
+        help="Answer replayed requests with their recorded latencies instead of at once"
     )
 
     args = parser.parse_args()
 
     mode = mode_mapping[args.mode]
 
-    match mode:
-        case "chain_to_chain":
-            await chain_to_chain(args.routing_mode)
-        case "bungee_refuel":
-            await bungee_refuel(args.routing_mode)
-        case "balance_checker":
-            await balance_checker()
-        case "wallet_generator":
-            wallet_generator()
-        case "core_script":  # default
-            await balance_checker()
-            await core_script()
+    if args.report:
+        from modules.tracing import report
+
+        print(report())
+        return
+
+    # Subsystems are imported per mode, so a mode does not pay for building chains and contracts it does not use
+    if mode == "wallet_generator":
+        from modules.wallet_generator import create_wallet as wallet_generator
+
+        wallet_generator()
+        return
+
+    from config import METRICS_PORT, PRIVATE_KEYS
+    from modules import metrics
+    from modules.cassette import cassette
+    from modules.chains import all_chains
+    from modules.http_session import session_manager
+    from modules.signer import signer
+    from modules.tracing import tracer
+
+    if args.record:
+        cassette.record(args.record)
+    elif args.replay:
+        cassette.replay(args.replay, timing=args.replay_timing)
+
+    metrics_server = await metrics.start_server(METRICS_PORT) if METRICS_PORT is not None else None
+
+    await session_manager.warm_up([rpc_url for chain in all_chains for rpc_url in chain.rpc_urls])
+    await signer.load(PRIVATE_KEYS)
+
+    if mode in ("chain_to_chain", "multi_hop", "core_script"):
+        from modules.fee_quotes import fee_quote_service
+
+        await fee_quote_service.warm_up()
+
+    try:
+        match mode:
+            case "chain_to_chain":
+                from modules.chain_to_chain import main as chain_to_chain
+
+                await chain_to_chain(args.routing_mode)
+            case "multi_hop":
+                from modules.chain_to_chain import multi_hop_main as multi_hop
+
+                await multi_hop(args.routing_mode, args.objective)
+            case "bungee_refuel":
+                from modules.bungee_refuel import main as bungee_refuel
+
+                await bungee_refuel(args.routing_mode)
+            case "balance_checker":
+                from modules.balance_checker import get_balances as balance_checker
+
+                await balance_checker()
+            case "core_script":  # default
+                from modules.balance_checker import get_balances as balance_checker
+                from modules.core_script import main as core_script
+
+                if not args.resume:
+                    await balance_checker()
+                await core_script(args.resume)
+    finally:
+        await session_manager.close()
+        signer.close()
+        tracer.close()
+        cassette.close()
+        if metrics_server is not None:
+            await metrics_server.cleanup()
 
+        if summary := metrics.summary_table():
+            logger.info("RPC AND HTTP METRICS")
+            print(summary)
 
 if __name__ == "__main__":
     try:
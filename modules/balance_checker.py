@@ -4,20 +4,12 @@ from colorama import Fore, Style
 from prettytable import PrettyTable
 from web3.contract import AsyncContract
 
-from config import PRIVATE_KEYS
+from config import MULTICALL_BATCH_SIZE, PRIVATE_KEYS
 from modules.chains import Chain, arbitrum, avalanche, base, bsc, optimism, polygon
 from modules.custom_logger import logger
+from modules.multicall import get_token_balances
 from modules.utils import get_token_decimals, get_token_symbol, wallet_public_address
 
-tokens = {
-    "POLYGON": polygon.usdc_contract,
-    "AVALANCHE": avalanche.usdc_contract,
-    "BSC": bsc.usdt_contract,
-    "ARBITRUM": arbitrum.usdt_contract,
-    "OPTIMISM": optimism.usdc_contract,
-    "BASE": base.usdc_contract,
-}
-
 supported_chains = [polygon, avalanche, bsc, arbitrum, optimism, base]
 
 TOKEN_SYMBOLS = ["USDC", "USDT", "USDbC"]
@@ -37,49 +29,57 @@ async def _get_token_data(token_contract: AsyncContract):
     return decimals, symbol
 
 
-async def _check_balance(wallet: str, token_contract: AsyncContract, skip_small: bool = True) -> tuple[float, str]:
-    """Check token balance for the specified wallet
+def _human_readable(balance: int | None, token_decimal: int, skip_small: bool = True) -> float | str:
+    """Convert raw token balance into a human readable value
 
     Args:
-        wallet:             wallet public address
-        token_contract:     web3 token contract
+        balance:            raw token balance, None if the call failed
+        token_decimal:      token decimals
         skip_small:         boolean flag to skip showing small values
     """
-    token_decimal, symbol = await _get_token_data(token_contract=token_contract)
-    balance = await token_contract.functions.balanceOf(wallet).call()
+    if balance is None:
+        return "N/A"
 
     human_readable = balance / 10**token_decimal
 
     if human_readable != 0 and human_readable < 0.01 and skip_small:
         human_readable = "DUST"
 
-    return human_readable, symbol
+    return human_readable
 
 
-async def _worker(wallet: str, chain: Chain) -> tuple[str, str, dict[str, float]]:
-    """Function for getting balance of a token for a given chain
+async def _worker(wallets: list[str], chain: Chain) -> list[tuple[str, str, dict[str, float]]]:
+    """Function for getting balances of a token for all wallets on a given chain.
+    All balanceOf calls are packed into Multicall3 batches.
 
     Args:
-        wallet:             wallet public address
+        wallets:            list of public addresses
         chain:              blockchain for checking
     """
-    token = tokens[chain.name]
-    balance, symbol = await _check_balance(wallet=wallet, token_contract=token)
+    token = chain.bridge_token_contract  # contracts and web3 instances are built on first use, not on import
+    token_decimal, symbol = await _get_token_data(token_contract=token)
+    chain_balances = await get_token_balances(
+        chain=chain, token_contract=token, wallets=wallets, batch_size=MULTICALL_BATCH_SIZE
+    )
 
-    return wallet, chain.name, {symbol: balance}
+    return [
+        (wallet, chain.name, {symbol: _human_readable(balance=balance, token_decimal=token_decimal)})
+        for wallet, balance in chain_balances.items()
+    ]
 
 
 async def _main(wallets: list[str], chains: list[Chain]) -> None:
-    """Async function for getting all balance of a specified token for specified wallet on a given chain
+    """Async function for getting all balance of a specified token for specified wallet on a given chain.
+    Chains are queried concurrently.
 
     Args:
         wallets:    list of public addresses
         chains      list of blockchains
     """
-    tasks = [_worker(wallet, chain) for wallet in wallets for chain in chains]
+    tasks = [_worker(wallets, chain) for chain in chains]
     results = await asyncio.gather(*tasks)
 
-    for wallet, chain_name, result in results:
+    for wallet, chain_name, result in (row for chain_results in results for row in chain_results):
         if wallet not in balances:
             balances[wallet] = {}
         if chain_name not in balances[wallet]:
@@ -0,0 +1,105 @@
+"""Per-chain block poller. One loop per chain follows new blocks and wakes all registered balance waiters"""
+import asyncio
+from collections import defaultdict
+
+from web3.contract import AsyncContract
+
+from config import BLOCK_POLL_INTERVAL
+from modules.chains import Chain
+from modules.custom_logger import logger
+from modules.multicall import get_token_balances
+
+
+class _BalanceWaiter:
+    def __init__(self, address: str, threshold: int, future: asyncio.Future):
+        self.address = address
+        self.threshold = threshold
+        self.future = future
+
+
+class BlockPoller:
+    """Follows new block numbers of a chain. On every new block balances of all registered waiters
+    are re-checked with one batched read per token, and waiters whose threshold is crossed are woken up.
+    The poller runs only while there are waiters.
+    """
+
+    def __init__(self, chain: Chain, interval: float = BLOCK_POLL_INTERVAL):
+        self.chain = chain
+        self.interval = interval
+        self.latest_block: int | None = None
+        self._tokens: dict[str, AsyncContract] = {}
+        self._waiters: dict[str, list[_BalanceWaiter]] = defaultdict(list)
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the poller is following new blocks right now"""
+        return self._task is not None and not self._task.done()
+
+    async def wait_for_balance(self, address: str, token_contract: AsyncContract, threshold: int) -> int:
+        """Wait until token balance of the address is at least threshold
+
+        Args:
+            address:            wallet address
+            token_contract:     token contract on the poller chain
+            threshold:          raw token balance to wait for
+
+        Returns:
+            raw token balance
+        """
+        waiter = _BalanceWaiter(
+            address=address, threshold=threshold, future=asyncio.get_running_loop().create_future()
+        )
+        self._tokens[token_contract.address] = token_contract
+        self._waiters[token_contract.address].append(waiter)
+
+        if not self.is_running:
+            self._task = asyncio.create_task(self._run())
+
+        try:
+            return await waiter.future
+        finally:
+            self._waiters[token_contract.address].remove(waiter)
+            if not self._waiters[token_contract.address]:
+                del self._waiters[token_contract.address]
+
+    async def _run(self) -> None:
+        while self._waiters:
+            try:
+                block_number = await self.chain.w3.eth.block_number
+                if block_number != self.latest_block:
+                    self.latest_block = block_number
+                    await self._check_waiters()
+            except Exception as e:
+                logger.warning(f"BLOCKS | {self.chain.name} | Polling failed: {e!r}")
+
+            await asyncio.sleep(self.interval)
+
+    async def _check_waiters(self) -> None:
+        token_addresses = list(self._waiters)
+        results = await asyncio.gather(
+            *[
+                get_token_balances(
+                    chain=self.chain,
+                    token_contract=self._tokens[token_address],
+                    wallets=list({waiter.address for waiter in self._waiters[token_address]}),
+                )
+                for token_address in token_addresses
+            ]
+        )
+
+        for token_address, balances in zip(token_addresses, results):
+            for waiter in list(self._waiters.get(token_address, [])):
+                balance = balances.get(waiter.address)
+                if balance is not None and balance >= waiter.threshold and not waiter.future.done():
+                    waiter.future.set_result(balance)
+
+
+_block_pollers: dict[str, BlockPoller] = {}
+
+
+def get_block_poller(chain: Chain) -> BlockPoller:
+    """Get the block poller of a chain. Pollers are created once per chain"""
+    if chain.name not in _block_pollers:
+        _block_pollers[chain.name] = BlockPoller(chain=chain)
+    return _block_pollers[chain.name]
@@ -1,14 +1,74 @@
 import asyncio
+from typing import Callable
 
+from eth_abi.exceptions import EncodingError
 from eth_typing import ChecksumAddress
 from hexbytes import HexBytes
 from loguru import logger
 from web3.contract import AsyncContract
-from web3.exceptions import ValidationError
 
+from config import BALANCE_WAIT_TIMEOUT, PIPELINE_APPROVE_SWAP
+from modules.block_poller import get_block_poller
+from modules.calldata import build_transaction, call, erc20_function, stargate_function
 from modules.chains import Chain
+from modules.fee_quotes import fee_quote_service
+from modules.gas_price import get_gas_price_service
+from modules.nonce_manager import nonce_manager
+from modules.token_registry import token_registry
 from modules.tokens import token_addresses
-from modules.utils import _send_transaction, get_min_amount_to_swap, get_token_decimals
+from modules.tracing import tracer
+from modules.utils import (
+    _submit_transaction,
+    _wait_for_transaction,
+    get_min_amount_to_swap,
+    get_token_decimals,
+    wallet_public_address,
+)
+
+
+async def _get_preflight_data(
+        address: str,
+        from_chain: Chain,
+        destination_chain_id: int,
+        stargate_from_chain_address: ChecksumAddress,
+        token_from_chain_contract: AsyncContract,
+) -> tuple[int, int, int, int]:
+    """Get all the data needed before a swap and sync the wallet nonce. The reads are issued concurrently,
+    so the chain provider sends them as one JSON-RPC batch request.
+
+    Args:
+        address:                        Wallet address
+        from_chain:                     Sending chain class
+        destination_chain_id:           Destination chain id from stargate docs
+        stargate_from_chain_address:    Address of Stargate Finance: Router at sending chain
+        token_from_chain_contract:      Sending chain token contract
+
+    Returns:
+        gas price, LayerZero fee, router allowance and token balance
+    """
+    _, gas_price, fee, allowance, token_balance = await asyncio.gather(
+        tracer.traced("nonce", nonce_manager.sync(chain=from_chain, address=address)),
+        tracer.traced("gas_price", get_gas_price_service(from_chain).get()),
+        tracer.traced(
+            "fee_quote", fee_quote_service.get(from_chain=from_chain, destination_chain_id=destination_chain_id)
+        ),
+        tracer.traced(
+            "allowance",
+            call(
+                from_chain.w3,
+                token_from_chain_contract.address,
+                erc20_function("allowance"),
+                address,
+                stargate_from_chain_address,
+            ),
+        ),
+        tracer.traced(
+            "token_balance",
+            call(from_chain.w3, token_from_chain_contract.address, erc20_function("balanceOf"), address),
+        ),
+    )
+
+    return gas_price, fee, allowance[0], token_balance[0]
 
 
 async def send_token_chain_to_chain(
@@ -22,9 +82,11 @@ async def send_token_chain_to_chain(
         token: str,
         amount_to_swap: int,
         from_chain_explorer: str,
-        gas: int
-) -> HexBytes:
+        gas: int,
+        on_sent: Callable[[str], None] | None = None,
+) -> HexBytes | None:
     """Send token from one blockchain to another. Tokens are sent to the same wallet.
+    Returns the swap transaction hash, None if the swap could not be built.
 
     Args:
         private_key:                    Wallet private key
@@ -38,119 +100,123 @@ async def send_token_chain_to_chain(
         amount_to_swap:                 Human readable amount to swap
         from_chain_explorer:            Sending chain explorer
         gas:                            Amount of gas
+        on_sent:                        Called with the swap hash as soon as the node accepts it,
+                                        before the receipt wait
     """
-    account = from_chain.w3.eth.account.from_key(private_key)
-    address = account.address
-
-    nonce = await from_chain.w3.eth.get_transaction_count(address)
-    gas_price = await from_chain.w3.eth.gas_price
-    fees = await stargate_from_chain_contract.functions.quoteLayerZeroFee(
-        transaction_info["chain_id"],  # uint16 _dstChainId
-        1,  # uint8 _functionType
-        "0x0000000000000000000000000000000000001010",  # bytes calldata _toAddress
-        "0x",  # bytes calldata _transferAndCallPayload
-        [0, 0, "0x0000000000000000000000000000000000000001"]  # Router.lz_tx_obj memory _lzTxParams
-    ).call()
-    fee = fees[0]
-
-    allowance = await token_from_chain_contract.functions.allowance(address, stargate_from_chain_address).call()
-    logger.debug(
-        f"ALLOWANCE | {address} | {from_chain_name} allowance for {token} is "
-        f"{allowance / 10 ** await get_token_decimals(token_from_chain_contract)}"
+    address = wallet_public_address(private_key)
+
+    gas_price, fee, allowance, token_balance = await _get_preflight_data(
+        address=address,
+        from_chain=from_chain,
+        destination_chain_id=transaction_info["chain_id"],
+        stargate_from_chain_address=stargate_from_chain_address,
+        token_from_chain_contract=token_from_chain_contract,
+    )
+    logger.opt(lazy=True).debug(
+        f"ALLOWANCE | {address} | {from_chain_name} allowance for {token} is {{}}",
+        lambda: (
+            allowance / 10**decimals
+            if (decimals := token_registry.cached_decimals(token_from_chain_contract)) is not None
+            else f"{allowance} (raw)"
+        ),
     )
 
+    approve_hex = None
     if allowance < amount_to_swap:
-        approve_txn = await token_from_chain_contract.functions.approve(
-            stargate_from_chain_address,
-            amount_to_swap
-        ).build_transaction(
-            {
-                "from": address,
-                "gas": 150000,
-                "gasPrice": gas_price,
-                "nonce": nonce
-            }
-        )
+        with tracer.span("approve"):
+            approve_txn = await build_transaction(
+                from_chain.w3,
+                token_from_chain_contract.address,
+                erc20_function("approve"),
+                (stargate_from_chain_address, amount_to_swap),
+                {
+                    "from": address,
+                    "gas": 150000,
+                    "gasPrice": gas_price,
+                    "nonce": await nonce_manager.get_nonce(chain=from_chain, address=address)
+                }
+            )
 
-        approve_txn = await _send_transaction(
-            address=address,
-            from_chain=from_chain,
-            transaction=approve_txn,
-            private_key=private_key
-        )
+            approve_hex = await _submit_transaction(
+                address=address,
+                from_chain=from_chain,
+                transaction=approve_txn,
+                private_key=private_key
+            )
         logger.info(
-            f"{from_chain_name} | {address} | {token} APPROVED " f"https://{from_chain_explorer}/tx/{approve_txn}"
+            f"{from_chain_name} | {address} | {token} APPROVED " f"https://{from_chain_explorer}/tx/{approve_hex}"
         )
 
-        nonce += 1
-
-        await asyncio.sleep(30)
-
-    token_balance = await token_from_chain_contract.functions.balanceOf(address).call()
+        if not PIPELINE_APPROVE_SWAP:
+            await _wait_for_transaction(address=address, from_chain=from_chain, hex_tr=approve_hex)
+            approve_hex = None
 
     if token_balance >= amount_to_swap:
+        amount_in, amount_out_min = transaction_info["amount_in"], transaction_info["amount_out_min"]
+    else:
+        amount_in, amount_out_min = token_balance, get_min_amount_to_swap(amount_to_swap=token_balance)
 
-        swap_txn = await stargate_from_chain_contract.functions.swap(
-            transaction_info["chain_id"],
-            transaction_info["source_pool_id"],
-            transaction_info["dest_pool_id"],
-            transaction_info["refund_address"],
-            transaction_info["amount_in"],
-            transaction_info["amount_out_min"],
-            transaction_info["lz_tx_obj"],
-            transaction_info["to"],
-            transaction_info["data"]
-        ).build_transaction(
-            {
-                "from": address,
-                "value": fee,
-                "gas": gas,
-                "gasPrice": await from_chain.w3.eth.gas_price,
-                "nonce": await from_chain.w3.eth.get_transaction_count(address),
-            }
-        )
-
-        return await _send_transaction(
-            address=address,
-            transaction=swap_txn,
-            from_chain=from_chain,
-            private_key=private_key
-        )
+    if amount_in <= 0:
+        logger.error(f"{from_chain_name} | {address} | Amount to be bridged is too low: {amount_in}")
+        return None
 
-    elif token_balance < amount_to_swap:
-
-        try:
-            min_amount = get_min_amount_to_swap(amount_to_swap=token_balance)
-
-            swap_txn = await stargate_from_chain_contract.functions.swap(
-                transaction_info["chain_id"],
-                transaction_info["source_pool_id"],
-                transaction_info["dest_pool_id"],
-                transaction_info["refund_address"],
-                token_balance,
-                min_amount,
-                transaction_info["lz_tx_obj"],
-                transaction_info["to"],
-                transaction_info["data"]
-            ).build_transaction(
+    try:
+        with tracer.span("swap_build"):
+            swap_txn = await build_transaction(
+                from_chain.w3,
+                stargate_from_chain_address,
+                stargate_function("swap"),
+                (
+                    transaction_info["chain_id"],
+                    transaction_info["source_pool_id"],
+                    transaction_info["dest_pool_id"],
+                    transaction_info["refund_address"],
+                    amount_in,
+                    amount_out_min,
+                    (*transaction_info["lz_tx_obj"][:2], HexBytes(transaction_info["lz_tx_obj"][2])),
+                    HexBytes(transaction_info["to"]),
+                    HexBytes(transaction_info["data"]),
+                ),
                 {
                     "from": address,
                     "value": fee,
                     "gas": gas,
-                    "gasPrice": await from_chain.w3.eth.gas_price,
-                    "nonce": await from_chain.w3.eth.get_transaction_count(address),
+                    "gasPrice": gas_price,
+                    "nonce": await nonce_manager.get_nonce(chain=from_chain, address=address),
                 }
             )
+    except EncodingError as e:
+        nonce_manager.reset(chain=from_chain, address=address)
+        logger.error(f"{from_chain_name} | {address} | Could not encode swap arguments: {e}")
+        return None
 
-            return await _send_transaction(
-                address=address,
-                transaction=swap_txn,
-                from_chain=from_chain,
-                private_key=private_key
-            )
+    try:
+        swap_hex = await _submit_transaction(
+            address=address,
+            transaction=swap_txn,
+            from_chain=from_chain,
+            private_key=private_key
+        )
+    except Exception:
+        fee_quote_service.invalidate(from_chain=from_chain, destination_chain_id=transaction_info["chain_id"])
+        raise
 
-        except ValidationError as e:
-            logger.error(f"Amount to be bridged is too low. Attempting raised an {e}")
+    if on_sent is not None:
+        on_sent(swap_hex)
+
+    # The swap has the next nonce after the approval, so it is never mined before the approval
+    if approve_hex is not None:
+        _, is_swapped = await asyncio.gather(
+            _wait_for_transaction(address=address, from_chain=from_chain, hex_tr=approve_hex),
+            _wait_for_transaction(address=address, from_chain=from_chain, hex_tr=swap_hex),
+        )
+    else:
+        is_swapped = await _wait_for_transaction(address=address, from_chain=from_chain, hex_tr=swap_hex)
+
+    if not is_swapped:
+        fee_quote_service.invalidate(from_chain=from_chain, destination_chain_id=transaction_info["chain_id"])
+
+    return swap_hex
 
 
 async def check_balance(address: str, token: str, token_contract: AsyncContract) -> int:
@@ -162,30 +228,52 @@ async def check_balance(address: str, token: str, token_contract: AsyncContract)
         token:              Token symbol
         token_contract:     token contract on a specified chain to interact with
     """
-    token_balance = await token_contract.functions.balanceOf(address).call()
+    (token_balance,) = await call(token_contract.w3, token_contract.address, erc20_function("balanceOf"), address)
+    decimals = await get_token_decimals(token_contract)
     logger.info(
         f"BALANCE | {address} | {token_addresses[token_contract.address.lower()]} {token} balance is "
-        f"{round(token_balance / 10 ** await get_token_decimals(token_contract), 2)}"
+        f"{round(token_balance / 10 ** decimals, 2)}"
     )
     return token_balance
 
 
-async def is_balance_updated(address: str, token: str, token_contract: AsyncContract, stop_if_zero: bool) -> bool:
+async def is_balance_updated(
+        address: str,
+        token: str,
+        token_contract: AsyncContract,
+        chain: Chain,
+        stop_if_zero: bool,
+        zero_balance_timeout: float = 90
+) -> bool:
     """Checks whether token balance on a specified chain is updated.
     (Is transfer completed or not)
+    Waiting is done by the chain block poller, which re-checks all waiting wallets once per new block.
+    Without stop_if_zero the wait is bounded by BALANCE_WAIT_TIMEOUT, e.g. if the previous leg reverted.
 
     Args:
-        address:            wallet address
-        token:              Token symbol
-        token_contract:     token contract on a specified chain to interact with
+        address:                wallet address
+        token:                  Token symbol
+        token_contract:         token contract on a specified chain to interact with
+        chain:                  chain of the token contract
+        stop_if_zero:           Stop waiting if balance is still zero after zero_balance_timeout
+        zero_balance_timeout:   Seconds to wait for a balance if stop_if_zero is set
     """
     balance = await check_balance(address=address, token=token, token_contract=token_contract)
 
-    if balance < (dust := 3 * (10 ** await get_token_decimals(token_contract))) and stop_if_zero:
-        return False
+    if balance >= (dust := 3 * (10 ** await get_token_decimals(token_contract))):
+        return True
 
-    while balance < dust:
-        await asyncio.sleep(10)
-        balance = await check_balance(address=address, token=token, token_contract=token_contract)
+    waiting = get_block_poller(chain).wait_for_balance(address=address, token_contract=token_contract, threshold=dust)
+    timeout = zero_balance_timeout if stop_if_zero else BALANCE_WAIT_TIMEOUT
+    try:
+        balance = await asyncio.wait_for(waiting, timeout=timeout)
+    except asyncio.TimeoutError:
+        if not stop_if_zero:
+            logger.error(f"BALANCE | {address} | No {chain.name} {token} balance after {timeout} seconds")
+        return False
 
+    logger.info(
+        f"BALANCE | {address} | {chain.name} {token} balance is "
+        f"{round(balance / 10 ** await get_token_decimals(token_contract), 2)}"
+    )
     return True
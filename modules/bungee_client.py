@@ -0,0 +1,57 @@
+""" Bungee Refuel metadata client
+    Docs: https://docs.socket.tech/socket-api/contract-addresses
+"""
+import time
+
+from config import BUNGEE_API_URL, BUNGEE_CACHE_TTL
+from modules.http_session import session_manager
+from modules.single_flight import SingleFlight
+
+
+class BungeeClient:
+    """Client for the Bungee Refuel chains document. The document is fetched at most once per TTL,
+    concurrent callers share one in-flight request, and limits are indexed by (from chain id, to chain id).
+    """
+
+    def __init__(self, base_url: str = BUNGEE_API_URL, ttl: float = BUNGEE_CACHE_TTL):
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self._limits: dict[tuple[int, int], dict] = {}
+        self._fetched_at: float | None = None
+        self._flights = SingleFlight()
+
+    async def _fetch(self) -> dict:
+        async with session_manager.get().get(f"{self.base_url}/chains") as response:
+            if response.status == 200:
+                return await response.json()
+            else:
+                raise ValueError("Could not fetch Bungee params")
+
+    async def _refresh(self) -> None:
+        data = await self._fetch()
+
+        self._limits = {
+            (chain["chainId"], limit["chainId"]): limit
+            for chain in data["result"]
+            for limit in chain["limits"]
+        }
+        self._fetched_at = time.monotonic()
+
+    async def _ensure_fresh(self) -> None:
+        if self._fetched_at is not None and time.monotonic() - self._fetched_at < self.ttl:
+            return
+
+        await self._flights.do("chains", self._refresh)
+
+    async def get_limits(self, from_chain_id: int, to_chain_id: int) -> dict | None:
+        """Get Bungee Refuel limits of a route. None if the route is unknown to Bungee
+
+        Args:
+            from_chain_id:  source chain id
+            to_chain_id:    destination chain id
+        """
+        await self._ensure_fresh()
+        return self._limits.get((from_chain_id, to_chain_id))
+
+
+bungee_client = BungeeClient()
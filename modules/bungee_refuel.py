@@ -6,12 +6,16 @@ import random
 import sys
 from typing import Coroutine
 
-import aiohttp
 from web3 import Web3
 
 from config import BUNGEE_AMOUNT, PRIVATE_KEYS
-from modules.chains import Chain, arbitrum, avalanche, base, bsc, optimism, polygon
+from modules.bungee_client import bungee_client
+from modules.calldata import build_transaction, bungee_refuel_function
+from modules.chains import Chain
 from modules.custom_logger import logger
+from modules.gas_price import get_gas_price_service
+from modules.nonce_manager import nonce_manager
+from modules.routes import bungee_routes
 from modules.utils import _send_transaction, get_token_price, wallet_public_address
 
 
@@ -19,29 +23,17 @@ async def get_bungee_refuel_amount(token_symbol: str):
     return round(BUNGEE_AMOUNT / await get_token_price(token_symbol=token_symbol), 5)
 
 
-async def _get_bungee_data() -> dict:
-    async with aiohttp.ClientSession() as session:
-        async with session.get("https://refuel.socket.tech/chains") as response:
-            if response.status == 200:
-                data = await response.json()
-                return data
-            else:
-                raise ValueError("Could not fetch Bungee params")
-
-
 async def _get_bungee_limits(from_chain: Chain, to_chain: Chain) -> tuple[int, int]:
-    bungee_params = await _get_bungee_data()
-
-    for chain in bungee_params["result"]:
-        if chain["chainId"] == from_chain.bungee_chain_id:
-            limits: list = chain["limits"]
+    destination_chain_limits = await bungee_client.get_limits(
+        from_chain_id=from_chain.bungee_chain_id, to_chain_id=to_chain.bungee_chain_id
+    )
 
-            for limit in limits:
-                if limit["chainId"] == to_chain.bungee_chain_id:
-                    if not limit["isEnabled"]:
-                        logger.error(msg := f"Destination chain {to_chain.name} is not enabled")
-                        raise ValueError(msg)
-                    destination_chain_limits: dict = limit
+    if destination_chain_limits is None:
+        logger.error(msg := f"Route from {from_chain.name} to {to_chain.name} is not supported by Bungee")
+        raise ValueError(msg)
+    if not destination_chain_limits["isEnabled"]:
+        logger.error(msg := f"Destination chain {to_chain.name} is not enabled")
+        raise ValueError(msg)
 
     return int(destination_chain_limits["minAmount"]), int(destination_chain_limits["maxAmount"])
 
@@ -70,17 +62,30 @@ async def _create_transaction(address: str, from_chain: Chain, to_chain: Chain,
         )
         raise ValueError(msg)
 
-    transaction = await from_chain.bungee_contract.functions.depositNativeToken(
-        to_chain.bungee_chain_id, address
-    ).build_transaction(
-        {
-            "from": address,
-            "gas": from_chain.gas * 2,
-            "gasPrice": await from_chain.w3.eth.gas_price,
-            "value": Web3.to_wei(amount, "ether"),
-            "nonce": await from_chain.w3.eth.get_transaction_count(address)
-        }
+    gas_price_service = get_gas_price_service(from_chain)
+    gas_price = await gas_price_service.get()
+    logger.info(
+        f"GAS | {address} | {from_chain.name} gas price is {gas_price / 10**9} gwei, "
+        f"fetched {round(gas_price_service.age, 1)} seconds ago"
     )
+    nonce = await nonce_manager.get_nonce(chain=from_chain, address=address)
+    try:
+        transaction = await build_transaction(
+            from_chain.w3,
+            from_chain.bungee_refuel_address,
+            bungee_refuel_function("depositNativeToken"),
+            (to_chain.bungee_chain_id, address),
+            {
+                "from": address,
+                "gas": from_chain.gas * 2,
+                "gasPrice": gas_price,
+                "value": Web3.to_wei(amount, "ether"),
+                "nonce": nonce
+            }
+        )
+    except Exception:
+        nonce_manager.reset(chain=from_chain, address=address)
+        raise
     logger.info(f"BUNGEE REFUEL | {address} | Transaction created")
     return transaction
 
@@ -95,326 +100,32 @@ async def bungee_refuel(from_chain: Chain, to_chain: Chain, private_key: str, am
 
 
 async def main(args: str):
-    mode_mapping = {
-        "pa": "polygon-avalanche",
-        "pb": "polygon-bsc",
-        "parb": "polygon-arbitrum",
-        "po": "polygon-optimism",
-        "pbase": "polygon-base",
-        "ap": "avalanche-polygon",
-        "ab": "avalanche-bsc",
-        "aarb": "avalanche-arbitrum",
-        "ao": "avalanche-optimism",
-        "abase": "avalanche-base",
-        "bp": "bsc-polygon",
-        "ba": "bsc-avalanche",
-        "barb": "bsc-arbitrum",
-        "bo": "bsc-optimism",
-        "bbase": "bsc-base",
-        "arbp": "arbitrum-polygon",
-        "arba": "arbitrum-avalanche",
-        "arbb": "arbitrum-bsc",
-        "arbo": "arbitrum-optimism",
-        "arbbase": "arbitrum-base",
-        "op": "optimism-polygon",
-        "oa": "optimism-avalanche",
-        "ob": "optimism-bsc",
-        "oarb": "optimism-arbitrum",
-        "obase": "optimism-base",
-        "basep": "base-polygon",
-        "basea": "base-avalanche",
-        "baseb": "base-bsc",
-        "basearb": "base-arbitrum",
-        "baseo": "base-optimism"
-    }
-
     if args is None:
         logger.error("Error: the route argument is required")
         sys.exit(2)
-    elif args not in mode_mapping.keys():
+    elif args not in bungee_routes:
         logger.error(
-            f"Unsupported route. Supported routes:\n{list(mode_mapping.values())}\n"
+            f"Unsupported route. Supported routes:\n{[route.name for route in bungee_routes.values()]}\n"
             "Usage example: type 'pa' for 'polygon-avalanche' route"
         )
         sys.exit(2)
 
-    mode = mode_mapping[args]
+    route = bungee_routes[args]
 
-    tasks: list[Coroutine] = []
-    for private_key in PRIVATE_KEYS:
-        match mode:
-            case "polygon-avalanche":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=polygon,
-                        to_chain=avalanche,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(polygon.native_asset_symbol)
-                    )
-                )
-            case "polygon-bsc":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=polygon,
-                        to_chain=bsc,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(polygon.native_asset_symbol)
-                    )
-                )
-            case "polygon-arbitrum":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=polygon,
-                        to_chain=arbitrum,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(polygon.native_asset_symbol)
-                    )
-                )
-            case "polygon-optimism":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=polygon,
-                        to_chain=optimism,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(polygon.native_asset_symbol)
-                    )
-                )
-            case "polygon-base":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=polygon,
-                        to_chain=base,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(polygon.native_asset_symbol)
-                    )
-                )
-            case "avalanche-polygon":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=avalanche,
-                        to_chain=polygon,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(avalanche.native_asset_symbol)
-                    )
-                )
-            case "avalanche-bsc":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=avalanche,
-                        to_chain=bsc,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(avalanche.native_asset_symbol)
-                    )
-                )
-            case "avalanche-arbitrum":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=avalanche,
-                        to_chain=arbitrum,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(avalanche.native_asset_symbol)
-                    )
-                )
-            case "avalanche-optimism":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=avalanche,
-                        to_chain=optimism,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(avalanche.native_asset_symbol)
-                    )
-                )
-            case "avalanche-base":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=avalanche,
-                        to_chain=base,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(avalanche.native_asset_symbol)
-                    )
-                )
-            case "bsc-polygon":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=bsc,
-                        to_chain=polygon,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(bsc.native_asset_symbol)
-                    )
-                )
-            case "bsc-avalanche":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=bsc,
-                        to_chain=avalanche,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(bsc.native_asset_symbol)
-                    )
-                )
-            case "bsc-arbitrum":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=bsc,
-                        to_chain=arbitrum,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(bsc.native_asset_symbol)
-                    )
-                )
-            case "bsc-optimism":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=bsc,
-                        to_chain=optimism,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(bsc.native_asset_symbol)
-                    )
-                )
-            case "bsc-base":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=bsc,
-                        to_chain=base,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(bsc.native_asset_symbol)
-                    )
-                )
-            case "arbitrum-polygon":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=arbitrum,
-                        to_chain=polygon,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(arbitrum.native_asset_symbol)
-                    )
-                )
-            case "arbitrum-avalanche":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=arbitrum,
-                        to_chain=avalanche,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(arbitrum.native_asset_symbol)
-                    )
-                )
-            case "arbitrum-bsc":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=arbitrum,
-                        to_chain=bsc,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(arbitrum.native_asset_symbol)
-                    )
-                )
-            case "arbitrum-optimism":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=arbitrum,
-                        to_chain=optimism,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(arbitrum.native_asset_symbol)
-                    )
-                )
-            case "arbitrum-base":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=arbitrum,
-                        to_chain=base,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(arbitrum.native_asset_symbol)
-                    )
-                )
-            case "optimism-polygon":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=optimism,
-                        to_chain=polygon,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(optimism.native_asset_symbol)
-                    )
-                )
-            case "optimism-avalanche":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=optimism,
-                        to_chain=avalanche,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(optimism.native_asset_symbol)
-                    )
-                )
-            case "optimism-bsc":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=optimism,
-                        to_chain=bsc,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(optimism.native_asset_symbol)
-                    )
-                )
-            case "optimism-arbitrum":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=optimism,
-                        to_chain=arbitrum,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(optimism.native_asset_symbol)
-                    )
-                )
-            case "optimism-base":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=optimism,
-                        to_chain=base,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(optimism.native_asset_symbol)
-                    )
-                )
-            case "base-polygon":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=base,
-                        to_chain=polygon,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(base.native_asset_symbol)
-                    )
-                )
-            case "base-avalanche":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=base,
-                        to_chain=avalanche,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(base.native_asset_symbol)
-                    )
-                )
-            case "base-bsc":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=base,
-                        to_chain=bsc,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(base.native_asset_symbol)
-                    )
-                )
-            case "base-arbitrum":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=base,
-                        to_chain=arbitrum,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(base.native_asset_symbol)
-                    )
-                )
-            case "base-optimism":
-                tasks.append(
-                    bungee_refuel(
-                        from_chain=base,
-                        to_chain=optimism,
-                        private_key=private_key,
-                        amount=await get_bungee_refuel_amount(base.native_asset_symbol)
-                    )
-                )
+    # The amount depends only on the route source chain, so its price is fetched once for all wallets
+    amount = await get_bungee_refuel_amount(route.from_chain.native_asset_symbol)
+
+    tasks: list[Coroutine] = [
+        bungee_refuel(
+            from_chain=route.from_chain,
+            to_chain=route.to_chain,
+            private_key=private_key,
+            amount=amount
+        )
+        for private_key in PRIVATE_KEYS
+    ]
 
-    logger.info(f"Doing Bungee Refuel {mode_mapping[args]}.")
+    logger.info(f"Doing Bungee Refuel {route.name}.")
     await asyncio.gather(*tasks, return_exceptions=True)
 
     logger.success("*** FINISHED ***")
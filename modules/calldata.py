@@ -0,0 +1,111 @@
+"""Precompiled contract calls. Selectors and ABI types are computed once per function,
+so hot paths build calldata and decode return data without web3 contract function machinery
+"""
+from functools import cache
+from typing import Any
+
+from eth_abi import decode, encode
+from eth_utils import function_abi_to_4byte_selector
+from eth_utils.abi import collapse_if_tuple
+from web3 import AsyncWeb3
+from web3.types import RPCEndpoint
+
+from abi import abi
+
+
+class PrecompiledFunction:
+    """Contract function with precomputed selector, argument types and return types
+
+    Args:
+        function_abi:   function entry of a contract ABI
+    """
+
+    def __init__(self, function_abi: dict):
+        self.name = function_abi["name"]
+        self.input_types = [collapse_if_tuple(argument) for argument in function_abi["inputs"]]
+        self.output_types = [collapse_if_tuple(output) for output in function_abi.get("outputs", [])]
+        self.selector = function_abi_to_4byte_selector(function_abi)
+
+    def encode(self, *args: Any) -> bytes:
+        """Build calldata. Tuple arguments are passed as tuples or lists"""
+        return self.selector + encode(self.input_types, args)
+
+    def encode_hex(self, *args: Any) -> str:
+        return "0x" + self.encode(*args).hex()
+
+    def decode(self, return_data: bytes) -> tuple:
+        """Decode return data into a tuple of outputs"""
+        return decode(self.output_types, return_data)
+
+    def __repr__(self) -> str:
+        return f"{self.name}({','.join(self.input_types)})"
+
+
+@cache
+def _precompile(abi_name: str, function_name: str) -> PrecompiledFunction:
+    function_abi = next(
+        entry
+        for entry in getattr(abi, abi_name)
+        if entry.get("type") == "function" and entry["name"] == function_name
+    )
+    return PrecompiledFunction(function_abi)
+
+
+def erc20_function(function_name: str) -> PrecompiledFunction:
+    """Get a precompiled ERC20 token function, e.g. "balanceOf" """
+    return _precompile("usdc_abi", function_name)
+
+
+def stargate_function(function_name: str) -> PrecompiledFunction:
+    """Get a precompiled Stargate router function, e.g. "swap" """
+    return _precompile("stargate_abi", function_name)
+
+
+def bungee_refuel_function(function_name: str) -> PrecompiledFunction:
+    """Get a precompiled Bungee Refuel function, e.g. "depositNativeToken" """
+    return _precompile("bungee_refuel_abi", function_name)
+
+
+def multicall3_function(function_name: str) -> PrecompiledFunction:
+    """Get a precompiled Multicall3 function, e.g. "aggregate3" """
+    return _precompile("multicall3_abi", function_name)
+
+
+async def call(w3: AsyncWeb3, to: str, function: PrecompiledFunction, *args: Any) -> tuple:
+    """Execute a read-only contract call with eth_call and decode its outputs.
+    The request goes straight to the chain provider, so it still joins the JSON-RPC batch of its event loop tick.
+
+    Args:
+        w3:         web3 instance of the chain to query
+        to:         contract address
+        function:   precompiled contract function
+        args:       function arguments
+    """
+    response = await w3.provider.make_request(
+        RPCEndpoint("eth_call"), [{"to": to, "data": function.encode_hex(*args)}, "latest"]
+    )
+    if "error" in response:
+        raise ValueError(response["error"])
+
+    return function.decode(bytes.fromhex(response["result"][2:]))
+
+
+async def build_transaction(
+    w3: AsyncWeb3, to: str, function: PrecompiledFunction, args: tuple, transaction: dict
+) -> dict:
+    """Build a contract transaction ready to be signed
+
+    Args:
+        w3:             web3 instance of the contract chain
+        to:             contract address
+        function:       precompiled contract function
+        args:           function arguments
+        transaction:    transaction fields, "gas", "gasPrice" and "nonce" are required
+    """
+    return {
+        "value": 0,
+        **transaction,
+        "to": to,
+        "data": function.encode_hex(*args),
+        "chainId": await w3.eth.chain_id,  # requested once per chain and cached by the provider
+    }
@@ -0,0 +1,233 @@
+"""Record and replay of JSON-RPC and REST traffic in JSON lines cassettes"""
+import asyncio
+import json
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import aiohttp
+from web3._utils.encoding import Web3JsonEncoder
+from web3.types import RPCEndpoint, RPCResponse
+
+from modules.custom_logger import logger
+
+RPC = "rpc"
+HTTP = "http"
+
+
+class CassetteMiss(LookupError):
+    """Replayed request has no recorded response left"""
+
+
+def _key(*parts: Any) -> str:
+    return json.dumps(parts, cls=Web3JsonEncoder, sort_keys=True, separators=(",", ":"))
+
+
+class _ReplayResponse:
+    """Recorded REST response with the part of aiohttp.ClientResponse interface the clients use"""
+
+    def __init__(self, method: str, url: str, status: int, body: str):
+        self.method = method
+        self.url = url
+        self.status = status
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body.encode()
+
+    async def text(self) -> str:
+        return self._body
+
+    async def json(self) -> Any:
+        return json.loads(self._body)
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                request_info=None, history=(), status=self.status, message=f"{self.method} {self.url}"
+            )
+
+
+class _ReplaySession:
+    """Stand-in of the shared aiohttp session answering GET requests from the cassette"""
+
+    closed = False
+
+    def __init__(self, cassette: "Cassette"):
+        self._cassette = cassette
+
+    @asynccontextmanager
+    async def get(self, url: str, params: dict | None = None, **kwargs: Any) -> AsyncIterator[_ReplayResponse]:
+        yield await self._cassette.play_http("GET", url, params)
+
+    @asynccontextmanager
+    async def head(self, url: str, **kwargs: Any) -> AsyncIterator[_ReplayResponse]:
+        yield _ReplayResponse("HEAD", url, 200, "")  # connection warm-up only
+
+    @asynccontextmanager
+    async def post(self, url: str, **kwargs: Any) -> AsyncIterator[_ReplayResponse]:
+        raise CassetteMiss(f"POST {url} is not replayed, JSON-RPC calls are replayed by chain providers")
+        yield
+
+    async def close(self) -> None:
+        pass
+
+
+class _RecordingSession:
+    """Shared aiohttp session wrapper recording responses of GET requests to the cassette"""
+
+    def __init__(self, session: aiohttp.ClientSession, cassette: "Cassette"):
+        self._session = session
+        self._cassette = cassette
+
+    @asynccontextmanager
+    async def get(self, url: str, params: dict | None = None, **kwargs: Any) -> AsyncIterator[aiohttp.ClientResponse]:
+        started = time.monotonic()
+        async with self._session.get(url, params=params, **kwargs) as response:
+            body = await response.text()  # the body stays cached in the response for the caller
+            self._cassette.record_http("GET", url, params, response.status, body, time.monotonic() - started)
+            yield response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+
+class Cassette:
+    """JSON lines cassette of JSON-RPC calls per chain and REST GET requests with their responses and latencies.
+    A recorded run can be replayed with no network at zero latency or at recorded timing.
+    Replayed requests get the recorded response of the same request in recording order. If the request differs,
+    e.g. a raw transaction signed for another random amount, the next unused response of the same method is used.
+    Cassettes are off until record or replay is called.
+    """
+
+    def __init__(self):
+        self.path: str | None = None
+        self.recording = False
+        self.replaying = False
+        self.timing = False
+        self.played = 0
+        self.misses = 0
+        self._file = None
+        self._records: list[dict] = []
+        self._used: list[bool] = []
+        self._by_request: dict[str, deque[int]] = {}
+        self._by_method: dict[str, deque[int]] = {}
+
+    def record(self, path: str) -> None:
+        """Record all traffic of the run to a new cassette at path"""
+        self.path = path
+        self.recording = True
+        self._file = open(path, "w")
+
+    def replay(self, path: str, timing: bool = False) -> None:
+        """Answer all traffic of the run from the cassette at path
+
+        Args:
+            path:       cassette path
+            timing:     wait for the recorded latency of every response instead of answering at once
+        """
+        self.path = path
+        self.replaying = True
+        self.timing = timing
+        with open(path) as file:
+            self._records = [json.loads(line) for line in file if line.strip()]
+        self._used = [False] * len(self._records)
+
+        for i, record in enumerate(self._records):
+            if record["type"] == RPC:
+                request_key = _key(RPC, record["chain"], record["method"], record["params"])
+                method_key = _key(RPC, record["chain"], record["method"])
+            else:
+                request_key = _key(HTTP, record["method"], record["url"], record["params"])
+                method_key = _key(HTTP, record["method"], record["url"])
+            self._by_request.setdefault(request_key, deque()).append(i)
+            self._by_method.setdefault(method_key, deque()).append(i)
+
+        logger.info(f"CASSETTE | Replaying {len(self._records)} recorded responses from {path}")
+
+    def _write(self, record: dict) -> None:
+        self._file.write(json.dumps(record, cls=Web3JsonEncoder, separators=(",", ":")) + "\n")
+
+    def record_rpc(self, chain: str, method: RPCEndpoint, params: Any, response: RPCResponse, latency: float) -> None:
+        self._write(
+            {
+                "type": RPC,
+                "chain": chain,
+                "method": method,
+                "params": params,
+                "response": response,
+                "latency": round(latency, 4),
+            }
+        )
+
+    def record_http(
+        self, method: str, url: str, params: dict | None, status: int, body: str, latency: float
+    ) -> None:
+        self._write(
+            {
+                "type": HTTP,
+                "method": method,
+                "url": url,
+                "params": params,
+                "status": status,
+                "body": body,
+                "latency": round(latency, 4),
+            }
+        )
+
+    def _next(self, queue: deque[int] | None) -> int | None:
+        while queue:
+            i = queue.popleft()
+            if not self._used[i]:
+                return i
+        return None
+
+    async def _play(self, request_key: str, method_key: str, description: str) -> dict:
+        i = self._next(self._by_request.get(request_key))
+        if i is None:
+            i = self._next(self._by_method.get(method_key))
+        if i is None:
+            self.misses += 1
+            raise CassetteMiss(f"No recorded response left for {description}")
+
+        self._used[i] = True
+        self.played += 1
+        record = self._records[i]
+        if self.timing:
+            await asyncio.sleep(record["latency"])
+        return record
+
+    async def play_rpc(self, chain: str, method: RPCEndpoint, params: Any) -> RPCResponse:
+        """Get the recorded response of a JSON-RPC call"""
+        record = await self._play(
+            _key(RPC, chain, method, params), _key(RPC, chain, method), f"{chain} {method}"
+        )
+        return record["response"]
+
+    async def play_http(self, method: str, url: str, params: dict | None) -> _ReplayResponse:
+        """Get the recorded response of a REST request"""
+        record = await self._play(
+            _key(HTTP, method, url, params), _key(HTTP, method, url), f"{method} {url}"
+        )
+        return _ReplayResponse(method, url, record["status"], record["body"])
+
+    def session(self, session: aiohttp.ClientSession | None) -> Any:
+        """Get the session to use instead of the shared one while recording or replaying"""
+        if self.replaying:
+            return _ReplaySession(self)
+        return _RecordingSession(session, self)
+
+    def close(self) -> None:
+        if self.recording and self._file is not None:
+            self._file.close()
+            self._file = None
+            logger.info(f"CASSETTE | Traffic is recorded to {self.path}")
+        elif self.replaying:
+            logger.info(
+                f"CASSETTE | Replayed {self.played} responses, {self.misses} requests were not recorded, "
+                f"{self._used.count(False)} recorded responses were not requested"
+            )
+
+
+cassette = Cassette()
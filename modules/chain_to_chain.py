@@ -1,17 +1,19 @@
 import asyncio
 import random
 import sys
-from typing import Coroutine
+from typing import Callable, Coroutine
 
 from eth_typing import ChecksumAddress
-from tqdm import tqdm
 from web3.contract import AsyncContract
 
-from config import AMOUNT_TO_SWAP, PRIVATE_KEYS
+from config import AMOUNT_TO_SWAP, PRIVATE_KEYS, START_DELAY_MAX, START_DELAY_MIN
 from modules.bridger import is_balance_updated, send_token_chain_to_chain
-from modules.chains import Chain, arbitrum, avalanche, base, bsc, fantom, optimism, polygon
+from modules.chains import Chain
 from modules.custom_logger import logger
-from modules.tokens import usdc, usdt
+from modules.dashboard import BALANCE_WAIT, BRIDGING, FAILED, SENT, START_DELAY, STOPPED, dashboard
+from modules.route_planner import CHEAPEST, route_planner
+from modules.routes import Route, routes_by_code, stargate_routes
+from modules.tracing import tracer
 from modules.utils import get_correct_amount_and_min_amount, get_token_decimals, wallet_public_address
 
 
@@ -30,8 +32,11 @@ async def chain_to_chain(
     from_chain_explorer: str,
     gas: int,
     stop_if_zero: bool = True,
-) -> bool:
+    wait_start_delay: bool = True,
+    on_sent: Callable[[str], None] | None = None,
+) -> str | None:
     """Transfer function. It bridges token from source blockchain to destination blockchain.
+    Returns the bridging transaction hash or None if nothing was sent.
     Stargate docs:  https://stargateprotocol.gitbook.io/stargate/developers
 
     Args:
@@ -49,788 +54,187 @@ async def chain_to_chain(
         from_chain_explorer:            Sending chain explorer
         gas:                            Amount of gas
         stop_if_zero:                   Stop trying if balance is zero
+        wait_start_delay:               Wait a random delay before bridging, off if the caller waited it out
+        on_sent:                        Called with the bridging transaction hash before its receipt wait
     """
     address = wallet_public_address(wallet)
+    leg = f"{from_chain_name}-{to_chain_name}".lower()
 
-    amount_to_swap, min_amount = await get_correct_amount_and_min_amount(
-        token_contract=token_from_chain_contract, amount_to_swap=AMOUNT_TO_SWAP
-    )
+    tracer.set_leg(wallet=address, chain=from_chain_name, route=leg)
 
-    start_delay = random.randint(1, 200)
-    logger.info(f"START DELAY | {address} | Waiting for {start_delay} seconds.")
-    with tqdm(
-        total=start_delay, desc=f"Waiting START DELAY | {address}", bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt}"
-    ) as pbar:
-        for _ in range(start_delay):
-            await asyncio.sleep(1)
-            pbar.update(1)
-
-    balance = None
-    logger_cntr = 0
-    while not balance:
-        await asyncio.sleep(30)
-
-        if logger_cntr % 3 == 0:
-            logger.info(f"BALANCE | {address} | Checking {from_chain_name} {token} balance")
-
-        balance = await is_balance_updated(
-            address=address, token=token, token_contract=token_from_chain_contract, stop_if_zero=stop_if_zero
+    with tracer.span("leg"):
+        amount_to_swap, min_amount = await get_correct_amount_and_min_amount(
+            token_contract=token_from_chain_contract, amount_to_swap=AMOUNT_TO_SWAP
         )
-        logger_cntr += 1
 
-        if logger_cntr == 3:
+        if wait_start_delay:
+            start_delay = random.randint(START_DELAY_MIN, START_DELAY_MAX)
+            logger.info(f"START DELAY | {address} | Waiting for {start_delay} seconds.")
+            dashboard.update(address, START_DELAY, leg=leg, delay=start_delay)
+            with tracer.span("start_delay"):
+                await asyncio.sleep(start_delay)
+
+        logger.info(f"BALANCE | {address} | Checking {from_chain_name} {token} balance")
+        dashboard.update(address, BALANCE_WAIT, leg=leg)
+        with tracer.span("balance_wait"):
+            balance = await is_balance_updated(
+                address=address,
+                token=token,
+                token_contract=token_from_chain_contract,
+                chain=from_chain,
+                stop_if_zero=stop_if_zero
+            )
+
+        if not balance:
             logger.info(
                 f"STOP | {address} | "
                 f"Stopping {from_chain_name} {token} due to zero balance and {stop_if_zero=} flag"
             )
-            return False
+            dashboard.update(address, STOPPED)
+            return None
+
+        decimals = await get_token_decimals(token_from_chain_contract)
+        logger.info(
+            f"BRIDGING | {address} | "
+            f"Trying to bridge {amount_to_swap / 10 ** decimals} "
+            f"{token} from {from_chain_name} to {to_chain_name}"
+        )
+        dashboard.update(address, BRIDGING)
+        try:
+            bridging_txn_hex = await send_token_chain_to_chain(
+                private_key=wallet,
+                from_chain=from_chain,
+                transaction_info={
+                    "chain_id": destination_chain_id,
+                    "source_pool_id": source_pool_id,
+                    "dest_pool_id": dest_pool_id,
+                    "refund_address": address,
+                    "amount_in": amount_to_swap,
+                    "amount_out_min": min_amount,
+                    "lz_tx_obj": [
+                        0,
+                        0,
+                        "0x0000000000000000000000000000000000000001"
+                    ],
+                    "to": address,
+                    "data": "0x"
+                },
+                stargate_from_chain_contract=stargate_from_chain_contract,
+                stargate_from_chain_address=stargate_from_chain_address,
+                token_from_chain_contract=token_from_chain_contract,
+                from_chain_name=from_chain_name,
+                token=token,
+                amount_to_swap=amount_to_swap,
+                from_chain_explorer=from_chain_explorer,
+                gas=gas,
+                on_sent=on_sent,
+            )
+        except Exception:
+            dashboard.update(address, FAILED)
+            raise
+        dashboard.update(address, SENT, tx=bridging_txn_hex)
 
-    logger.info(
-        f"BRIDGING | {address} | "
-        f"Trying to bridge {amount_to_swap / 10 ** await get_token_decimals(token_from_chain_contract)} "
-        f"{token} from {from_chain_name} to {to_chain_name}"
-    )
-    bridging_txn_hex = await send_token_chain_to_chain(
-        private_key=wallet,
-        from_chain=from_chain,
-        transaction_info={
-            "chain_id": destination_chain_id,
-            "source_pool_id": source_pool_id,
-            "dest_pool_id": dest_pool_id,
-            "refund_address": address,
-            "amount_in": amount_to_swap,
-            "amount_out_min": min_amount,
-            "lz_tx_obj": [
-                0,
-                0,
-                "0x0000000000000000000000000000000000000001"
-            ],
-            "to": address,
-            "data": "0x"
-        },
-        stargate_from_chain_contract=stargate_from_chain_contract,
-        stargate_from_chain_address=stargate_from_chain_address,
-        token_from_chain_contract=token_from_chain_contract,
-        from_chain_name=from_chain_name,
-        token=token,
-        amount_to_swap=amount_to_swap,
-        from_chain_explorer=from_chain_explorer,
-        gas=gas
+        logger.success(
+            f"{from_chain_name} | {address} | Transaction: https://{from_chain_explorer}/tx/{bridging_txn_hex}"
+        )
+        logger.success(f"LAYERZEROSCAN | {address} | Transaction: https://layerzeroscan.com/tx/{bridging_txn_hex}")
+
+        return bridging_txn_hex
+
+
+async def bridge_route(
+    wallet: str,
+    route: Route,
+    stop_if_zero: bool = True,
+    wait_start_delay: bool = True,
+    on_sent: Callable[[str], None] | None = None,
+) -> str | None:
+    """Bridge token along a route from the route registry. Returns the bridging transaction hash
+
+    Args:
+        wallet:             Wallet private key
+        route:              Route descriptor
+        stop_if_zero:       Stop trying if balance is zero
+        wait_start_delay:   Wait a random delay before bridging
+        on_sent:            Called with the bridging transaction hash before its receipt wait
+    """
+    return await chain_to_chain(
+        wallet=wallet,
+        from_chain_name=route.from_chain.name,
+        token=route.token.name,
+        token_from_chain_contract=route.token_contract,
+        to_chain_name=route.to_chain.name,
+        from_chain=route.from_chain,
+        destination_chain_id=route.destination_chain_id,
+        source_pool_id=route.source_pool_id,
+        dest_pool_id=route.dest_pool_id,
+        stargate_from_chain_contract=route.from_chain.stargate_contract,
+        stargate_from_chain_address=route.from_chain.stargate_router_address,
+        from_chain_explorer=route.from_chain.explorer,
+        gas=route.gas,
+        stop_if_zero=stop_if_zero,
+        wait_start_delay=wait_start_delay,
+        on_sent=on_sent,
     )
-    logger.success(f"{from_chain_name} | {address} | Transaction: https://{from_chain_explorer}/tx/{bridging_txn_hex}")
-    logger.success(f"LAYERZEROSCAN | {address} | Transaction: https://layerzeroscan.com/tx/{bridging_txn_hex}")
 
-    return True
 
+async def bridge_plan(wallet: str, legs: list[Route]) -> bool:
+    """Bridge token along a sequence of legs. Every next leg waits for tokens of the previous one to arrive
 
-async def main(args: str):
+    Args:
+        wallet:     Wallet private key
+        legs:       Routes to bridge along, in order
+    """
+    for i, leg in enumerate(legs):
+        if not await bridge_route(wallet=wallet, route=leg, stop_if_zero=i == 0):
+            return False
+
+    return True
 
-    mode_mapping = {
-        "pf": "polygon-fantom",
-        "pa": "polygon-avalanche",
-        "pb": "polygon-bsc",
-        "parb": "polygon-arbitrum",
-        "po": "polygon-optimism",
-        "pbase": "polygon-base",
-        "fp": "fantom-polygon",
-        "fa": "fantom-avalanche",
-        "fb": "fantom-bsc",
-        "ap": "avalanche-polygon",
-        "af": "avalanche-fantom",
-        "ab": "avalanche-bsc",
-        "aarb": "avalanche-arbitrum",
-        "ao": "avalanche-optimism",
-        "abase": "avalanche-base",
-        "bp": "bsc-polygon",
-        "bf": "bsc-fantom",
-        "ba": "bsc-avalanche",
-        "barb": "bsc-arbitrum",
-        "bo": "bsc-optimism",
-        "bbase": "bsc-base",
-        "arbp": "arbitrum-polygon",
-        "arba": "arbitrum-avalanche",
-        "arbb": "arbitrum-bsc",
-        "arbo": "arbuitrum-optimism",
-        "arbbase": "arbitrum-base",
-        "op": "optimism-polygon",
-        "oa": "optimism-avalanche",
-        "ob": "optimism-bsc",
-        "oarb": "optimism-arbitrum",
-        "obase": "optimism-base",
-        "basep": "base-polygon",
-        "basea": "base-avalanche",
-        "baseb": "base-bsc",
-        "basearb": "base-arbitrum",
-        "baseo": "base-optimism"
-    }
 
+async def main(args: str):
     logger.info(args)
     if args is None:
         print("Error: the route argument is required")
         sys.exit(2)
-    elif args not in mode_mapping.keys():
+    elif args not in stargate_routes:
         logger.error(
-            f"Unsupported route. Supported routes:\n{list(mode_mapping.values())}\n"
+            f"Unsupported route. Supported routes:\n{[route.name for route in stargate_routes.values()]}\n"
             "Usage example: type 'pa' for 'polygon-avalanche' route"
         )
         sys.exit(2)
 
-    mode = mode_mapping[args]
-
-    tasks: list[Coroutine] = []
-    for wallet in PRIVATE_KEYS:
-        match mode:
-            case "polygon-fantom":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=polygon.name,
-                        token=usdc.name,
-                        token_from_chain_contract=polygon.usdc_contract,
-                        to_chain_name=fantom.name,
-                        from_chain=polygon,
-                        destination_chain_id=fantom.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=polygon.stargate_contract,
-                        stargate_from_chain_address=polygon.stargate_router_address,
-                        from_chain_explorer=polygon.explorer,
-                        gas=polygon.gas
-                    )
-                )
-            case "polygon-avalanche":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=polygon.name,
-                        token=usdc.name,
-                        token_from_chain_contract=polygon.usdc_contract,
-                        to_chain_name=avalanche.name,
-                        from_chain=polygon,
-                        destination_chain_id=avalanche.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=polygon.stargate_contract,
-                        stargate_from_chain_address=polygon.stargate_router_address,
-                        from_chain_explorer=polygon.explorer,
-                        gas=polygon.gas
-                    )
-                )
-            case "polygon-bsc":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=polygon.name,
-                        token=usdc.name,
-                        token_from_chain_contract=polygon.usdc_contract,
-                        to_chain_name=bsc.name,
-                        from_chain=polygon,
-                        destination_chain_id=bsc.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdt.stargate_pool_id,
-                        stargate_from_chain_contract=polygon.stargate_contract,
-                        stargate_from_chain_address=polygon.stargate_router_address,
-                        from_chain_explorer=polygon.explorer,
-                        gas=polygon.gas
-                    )
-                )
-            case "polygon-arbitrum":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=polygon.name,
-                        token=usdc.name,
-                        token_from_chain_contract=polygon.usdc_contract,
-                        to_chain_name=arbitrum.name,
-                        from_chain=polygon,
-                        destination_chain_id=arbitrum.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdt.stargate_pool_id,
-                        stargate_from_chain_contract=polygon.stargate_contract,
-                        stargate_from_chain_address=polygon.stargate_router_address,
-                        from_chain_explorer=polygon.explorer,
-                        gas=polygon.gas
-                    )
-                )
-            case "polygon-optimism":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=polygon.name,
-                        token=usdc.name,
-                        token_from_chain_contract=polygon.usdc_contract,
-                        to_chain_name=optimism.name,
-                        from_chain=polygon,
-                        destination_chain_id=optimism.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=polygon.stargate_contract,
-                        stargate_from_chain_address=polygon.stargate_router_address,
-                        from_chain_explorer=polygon.explorer,
-                        gas=polygon.gas
-                    )
-                )
-            case "polygon-base":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=polygon.name,
-                        token=usdc.name,
-                        token_from_chain_contract=polygon.usdc_contract,
-                        to_chain_name=base.name,
-                        from_chain=polygon,
-                        destination_chain_id=base.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=polygon.stargate_contract,
-                        stargate_from_chain_address=polygon.stargate_router_address,
-                        from_chain_explorer=polygon.explorer,
-                        gas=polygon.gas
-                    )
-                )
-            case "fantom-polygon":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=fantom.name,
-                        token=usdc.name,
-                        token_from_chain_contract=fantom.usdc_contract,
-                        to_chain_name=polygon.name,
-                        from_chain=fantom,
-                        destination_chain_id=polygon.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=fantom.stargate_contract,
-                        stargate_from_chain_address=fantom.stargate_router_address,
-                        from_chain_explorer=fantom.explorer,
-                        gas=fantom.gas
-                    )
-                )
-            case "fantom-avalanche":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=fantom.name,
-                        token=usdc.name,
-                        token_from_chain_contract=fantom.usdc_contract,
-                        to_chain_name=avalanche.name,
-                        from_chain=fantom,
-                        destination_chain_id=avalanche.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=fantom.stargate_contract,
-                        stargate_from_chain_address=fantom.stargate_router_address,
-                        from_chain_explorer=fantom.explorer,
-                        gas=fantom.gas
-                    )
-                )
-            case "fantom-bsc":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=fantom.name,
-                        token=usdc.name,
-                        token_from_chain_contract=fantom.usdc_contract,
-                        to_chain_name=bsc.name,
-                        from_chain=fantom,
-                        destination_chain_id=bsc.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdt.stargate_pool_id,
-                        stargate_from_chain_contract=fantom.stargate_contract,
-                        stargate_from_chain_address=fantom.stargate_router_address,
-                        from_chain_explorer=fantom.explorer,
-                        gas=fantom.gas
-                    )
-                )
-            case "avalanche-polygon":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=avalanche.name,
-                        token=usdc.name,
-                        token_from_chain_contract=avalanche.usdc_contract,
-                        to_chain_name=polygon.name,
-                        from_chain=avalanche,
-                        destination_chain_id=polygon.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=avalanche.stargate_contract,
-                        stargate_from_chain_address=avalanche.stargate_router_address,
-                        from_chain_explorer=avalanche.explorer,
-                        gas=avalanche.gas
-                    )
-                )
-            case "avalanche-fantom":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=avalanche.name,
-                        token=usdc.name,
-                        token_from_chain_contract=avalanche.usdc_contract,
-                        to_chain_name=fantom.name,
-                        from_chain=avalanche,
-                        destination_chain_id=fantom.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=avalanche.stargate_contract,
-                        stargate_from_chain_address=avalanche.stargate_router_address,
-                        from_chain_explorer=avalanche.explorer,
-                        gas=avalanche.gas
-                    )
-                )
-            case "avalanche-bsc":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=avalanche.name,
-                        token=usdc.name,
-                        token_from_chain_contract=avalanche.usdc_contract,
-                        to_chain_name=bsc.name,
-                        from_chain=avalanche,
-                        destination_chain_id=bsc.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdt.stargate_pool_id,
-                        stargate_from_chain_contract=avalanche.stargate_contract,
-                        stargate_from_chain_address=avalanche.stargate_router_address,
-                        from_chain_explorer=avalanche.explorer,
-                        gas=avalanche.gas
-                    )
-                )
-            case "avalanche-arbitrum":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=avalanche.name,
-                        token=usdc.name,
-                        token_from_chain_contract=avalanche.usdc_contract,
-                        to_chain_name=arbitrum.name,
-                        from_chain=avalanche,
-                        destination_chain_id=arbitrum.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdt.stargate_pool_id,
-                        stargate_from_chain_contract=avalanche.stargate_contract,
-                        stargate_from_chain_address=avalanche.stargate_router_address,
-                        from_chain_explorer=avalanche.explorer,
-                        gas=avalanche.gas
-                    )
-                )
-            case "avalanche-optimism":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=avalanche.name,
-                        token=usdc.name,
-                        token_from_chain_contract=avalanche.usdc_contract,
-                        to_chain_name=optimism.name,
-                        from_chain=avalanche,
-                        destination_chain_id=optimism.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=avalanche.stargate_contract,
-                        stargate_from_chain_address=avalanche.stargate_router_address,
-                        from_chain_explorer=avalanche.explorer,
-                        gas=avalanche.gas
-                    )
-                )
-            case "avalanche-base":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=avalanche.name,
-                        token=usdc.name,
-                        token_from_chain_contract=avalanche.usdc_contract,
-                        to_chain_name=base.name,
-                        from_chain=avalanche,
-                        destination_chain_id=base.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=avalanche.stargate_contract,
-                        stargate_from_chain_address=avalanche.stargate_router_address,
-                        from_chain_explorer=avalanche.explorer,
-                        gas=avalanche.gas
-                    )
-                )
-            case "bsc-polygon":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=bsc.name,
-                        token=usdt.name,
-                        token_from_chain_contract=bsc.usdt_contract,
-                        to_chain_name=polygon.name,
-                        from_chain=bsc,
-                        destination_chain_id=polygon.layer_zero_chain_id,
-                        source_pool_id=usdt.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=bsc.stargate_contract,
-                        stargate_from_chain_address=bsc.stargate_router_address,
-                        from_chain_explorer=bsc.explorer,
-                        gas=bsc.gas
-                    )
-                )
-            case "bsc-fantom":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=bsc.name,
-                        token=usdt.name,
-                        token_from_chain_contract=bsc.usdt_contract,
-                        to_chain_name=fantom.name,
-                        from_chain=bsc,
-                        destination_chain_id=fantom.layer_zero_chain_id,
-                        source_pool_id=usdt.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=bsc.stargate_contract,
-                        stargate_from_chain_address=bsc.stargate_router_address,
-                        from_chain_explorer=bsc.explorer,
-                        gas=bsc.gas
-                    )
-
-                )
-            case "bsc-avalanche":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=bsc.name,
-                        token=usdt.name,
-                        token_from_chain_contract=bsc.usdt_contract,
-                        to_chain_name=avalanche.name,
-                        from_chain=bsc,
-                        destination_chain_id=avalanche.layer_zero_chain_id,
-                        source_pool_id=usdt.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=bsc.stargate_contract,
-                        stargate_from_chain_address=bsc.stargate_router_address,
-                        from_chain_explorer=bsc.explorer,
-                        gas=bsc.gas
-                    )
-                )
-            case "bsc-arbitrum":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=bsc.name,
-                        token=usdt.name,
-                        token_from_chain_contract=bsc.usdt_contract,
-                        to_chain_name=arbitrum.name,
-                        from_chain=bsc,
-                        destination_chain_id=arbitrum.layer_zero_chain_id,
-                        source_pool_id=usdt.stargate_pool_id,
-                        dest_pool_id=usdt.stargate_pool_id,
-                        stargate_from_chain_contract=bsc.stargate_contract,
-                        stargate_from_chain_address=bsc.stargate_router_address,
-                        from_chain_explorer=bsc.explorer,
-                        gas=bsc.gas
-                    )
-                )
-            case "bsc-optimism":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=bsc.name,
-                        token=usdt.name,
-                        token_from_chain_contract=bsc.usdt_contract,
-                        to_chain_name=optimism.name,
-                        from_chain=bsc,
-                        destination_chain_id=optimism.layer_zero_chain_id,
-                        source_pool_id=usdt.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=bsc.stargate_contract,
-                        stargate_from_chain_address=bsc.stargate_router_address,
-                        from_chain_explorer=bsc.explorer,
-                        gas=bsc.gas
-                    )
-                )
-            case "bsc-base":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=bsc.name,
-                        token=usdt.name,
-                        token_from_chain_contract=bsc.usdt_contract,
-                        to_chain_name=base.name,
-                        from_chain=bsc,
-                        destination_chain_id=base.layer_zero_chain_id,
-                        source_pool_id=usdt.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=bsc.stargate_contract,
-                        stargate_from_chain_address=bsc.stargate_router_address,
-                        from_chain_explorer=bsc.explorer,
-                        gas=bsc.gas
-                    )
-                )
-            case "arbitrum-polygon":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=arbitrum.name,
-                        token=usdt.name,
-                        token_from_chain_contract=arbitrum.usdt_contract,
-                        to_chain_name=polygon.name,
-                        from_chain=arbitrum,
-                        destination_chain_id=polygon.layer_zero_chain_id,
-                        source_pool_id=usdt.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=arbitrum.stargate_contract,
-                        stargate_from_chain_address=arbitrum.stargate_router_address,
-                        from_chain_explorer=arbitrum.explorer,
-                        gas=arbitrum.gas
-                    )
-                )
-            case "arbitrum-avalanche":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=arbitrum.name,
-                        token=usdt.name,
-                        token_from_chain_contract=arbitrum.usdt_contract,
-                        to_chain_name=avalanche.name,
-                        from_chain=arbitrum,
-                        destination_chain_id=avalanche.layer_zero_chain_id,
-                        source_pool_id=usdt.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=arbitrum.stargate_contract,
-                        stargate_from_chain_address=arbitrum.stargate_router_address,
-                        from_chain_explorer=arbitrum.explorer,
-                        gas=arbitrum.gas
-                    )
-                )
-            case "arbitrum-bsc":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=arbitrum.name,
-                        token=usdt.name,
-                        token_from_chain_contract=arbitrum.usdt_contract,
-                        to_chain_name=bsc.name,
-                        from_chain=arbitrum,
-                        destination_chain_id=bsc.layer_zero_chain_id,
-                        source_pool_id=usdt.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=arbitrum.stargate_contract,
-                        stargate_from_chain_address=arbitrum.stargate_router_address,
-                        from_chain_explorer=arbitrum.explorer,
-                        gas=arbitrum.gas
-                    )
-                )
-            case "arbitrum-optimism":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=arbitrum.name,
-                        token=usdt.name,
-                        token_from_chain_contract=arbitrum.usdt_contract,
-                        to_chain_name=optimism.name,
-                        from_chain=arbitrum,
-                        destination_chain_id=optimism.layer_zero_chain_id,
-                        source_pool_id=usdt.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=arbitrum.stargate_contract,
-                        stargate_from_chain_address=arbitrum.stargate_router_address,
-                        from_chain_explorer=arbitrum.explorer,
-                        gas=arbitrum.gas
-                    )
-                )
-            case "arbitrum-base":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=arbitrum.name,
-                        token=usdt.name,
-                        token_from_chain_contract=arbitrum.usdt_contract,
-                        to_chain_name=base.name,
-                        from_chain=arbitrum,
-                        destination_chain_id=base.layer_zero_chain_id,
-                        source_pool_id=usdt.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=arbitrum.stargate_contract,
-                        stargate_from_chain_address=arbitrum.stargate_router_address,
-                        from_chain_explorer=arbitrum.explorer,
-                        gas=arbitrum.gas
-                    )
-                )
-            case "optimism-polygon":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=optimism.name,
-                        token=usdc.name,
-                        token_from_chain_contract=optimism.usdc_contract,
-                        to_chain_name=polygon.name,
-                        from_chain=optimism,
-                        destination_chain_id=polygon.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=optimism.stargate_contract,
-                        stargate_from_chain_address=optimism.stargate_router_address,
-                        from_chain_explorer=optimism.explorer,
-                        gas=optimism.gas
-                    )
-                )
-            case "optimism-avalanche":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=optimism.name,
-                        token=usdc.name,
-                        token_from_chain_contract=optimism.usdc_contract,
-                        to_chain_name=avalanche.name,
-                        from_chain=optimism,
-                        destination_chain_id=avalanche.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=optimism.stargate_contract,
-                        stargate_from_chain_address=optimism.stargate_router_address,
-                        from_chain_explorer=optimism.explorer,
-                        gas=optimism.gas
-                    )
-                )
-            case "optimism-bsc":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=optimism.name,
-                        token=usdc.name,
-                        token_from_chain_contract=optimism.usdc_contract,
-                        to_chain_name=bsc.name,
-                        from_chain=optimism,
-                        destination_chain_id=bsc.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdt.stargate_pool_id,
-                        stargate_from_chain_contract=optimism.stargate_contract,
-                        stargate_from_chain_address=optimism.stargate_router_address,
-                        from_chain_explorer=optimism.explorer,
-                        gas=optimism.gas
-                    )
-                )
-            case "optimism-arbitrum":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=optimism.name,
-                        token=usdc.name,
-                        token_from_chain_contract=optimism.usdc_contract,
-                        to_chain_name=arbitrum.name,
-                        from_chain=optimism,
-                        destination_chain_id=arbitrum.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdt.stargate_pool_id,
-                        stargate_from_chain_contract=optimism.stargate_contract,
-                        stargate_from_chain_address=optimism.stargate_router_address,
-                        from_chain_explorer=optimism.explorer,
-                        gas=optimism.gas
-                    )
-                )
-            case "optimism-base":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=optimism.name,
-                        token=usdc.name,
-                        token_from_chain_contract=optimism.usdc_contract,
-                        to_chain_name=base.name,
-                        from_chain=optimism,
-                        destination_chain_id=base.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=optimism.stargate_contract,
-                        stargate_from_chain_address=optimism.stargate_router_address,
-                        from_chain_explorer=optimism.explorer,
-                        gas=optimism.gas
-                    )
-                )
-            case "base-polygon":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=base.name,
-                        token=usdc.name,
-                        token_from_chain_contract=base.usdc_contract,
-                        to_chain_name=polygon.name,
-                        from_chain=base,
-                        destination_chain_id=polygon.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=base.stargate_contract,
-                        stargate_from_chain_address=base.stargate_router_address,
-                        from_chain_explorer=base.explorer,
-                        gas=base.gas
-                    )
-                )
-            case "base-avalanche":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=base.name,
-                        token=usdc.name,
-                        token_from_chain_contract=base.usdc_contract,
-                        to_chain_name=avalanche.name,
-                        from_chain=base,
-                        destination_chain_id=avalanche.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=base.stargate_contract,
-                        stargate_from_chain_address=base.stargate_router_address,
-                        from_chain_explorer=base.explorer,
-                        gas=base.gas
-                    )
-                )
-            case "base-bsc":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=base.name,
-                        token=usdc.name,
-                        token_from_chain_contract=base.usdc_contract,
-                        to_chain_name=bsc.name,
-                        from_chain=base,
-                        destination_chain_id=bsc.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdt.stargate_pool_id,
-                        stargate_from_chain_contract=base.stargate_contract,
-                        stargate_from_chain_address=base.stargate_router_address,
-                        from_chain_explorer=base.explorer,
-                        gas=base.gas
-                    )
-                )
-            case "base-arbitrum":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=base.name,
-                        token=usdc.name,
-                        token_from_chain_contract=base.usdc_contract,
-                        to_chain_name=arbitrum.name,
-                        from_chain=base,
-                        destination_chain_id=arbitrum.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdt.stargate_pool_id,
-                        stargate_from_chain_contract=base.stargate_contract,
-                        stargate_from_chain_address=base.stargate_router_address,
-                        from_chain_explorer=base.explorer,
-                        gas=base.gas
-                    )
-                )
-            case "base-optimism":
-                tasks.append(
-                    chain_to_chain(
-                        wallet=wallet,
-                        from_chain_name=base.name,
-                        token=usdc.name,
-                        token_from_chain_contract=base.usdc_contract,
-                        to_chain_name=optimism.name,
-                        from_chain=base,
-                        destination_chain_id=optimism.layer_zero_chain_id,
-                        source_pool_id=usdc.stargate_pool_id,
-                        dest_pool_id=usdc.stargate_pool_id,
-                        stargate_from_chain_contract=base.stargate_contract,
-                        stargate_from_chain_address=base.stargate_router_address,
-                        from_chain_explorer=base.explorer,
-                        gas=base.gas
-                    )
-                )
-
-    logger.info(f"Bridging {mode_mapping[args]}.")
-    await asyncio.gather(*tasks, return_exceptions=True)
+    route = stargate_routes[args]
+
+    tasks: list[Coroutine] = [bridge_route(wallet=wallet, route=route) for wallet in PRIVATE_KEYS]
+
+    logger.info(f"Bridging {route.name}.")
+    async with dashboard.show():
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    logger.success("*** FINISHED ***")
+
+
+async def multi_hop_main(args: str, objective: str = CHEAPEST):
+    if args is None:
+        logger.error("Error: the route argument is required")
+        sys.exit(2)
+    elif args not in routes_by_code:
+        logger.error(
+            f"Unsupported route. Supported routes:\n{[route.name for route in routes_by_code.values()]}\n"
+            "Usage example: type 'fbase' for 'fantom-base' route"
+        )
+        sys.exit(2)
+
+    route = routes_by_code[args]
+
+    # The plan is computed once and shared by all wallets
+    legs = await route_planner.plan(from_chain=route.from_chain, to_chain=route.to_chain, objective=objective)
+
+    tasks: list[Coroutine] = [bridge_plan(wallet=wallet, legs=legs) for wallet in PRIVATE_KEYS]
+
+    logger.info(f"Bridging {route.name} in {len(legs)} legs.")
+    async with dashboard.show():
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     logger.success("*** FINISHED ***")
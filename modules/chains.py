@@ -1,10 +1,17 @@
 """Blockchain classes and  info"""
+from functools import cached_property
 from typing import Optional
 
-from web3 import AsyncWeb3, AsyncHTTPProvider
+from eth_utils import to_checksum_address
+from web3 import AsyncWeb3
+from web3.contract import AsyncContract
 
-from modules.tokens import usdc, usdt
-from abi.abi import stargate_abi, usdc_abi, usdt_abi, bungee_refuel_abi
+from modules.providers import RpcPoolProvider
+from modules.tokens import Token, usdc, usdt
+from abi import abi
+
+# Multicall3 is deployed at the same address on every supported chain: https://www.multicall3.com/deployments
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
 
 
 class Chain:
@@ -12,7 +19,7 @@ class Chain:
             self,
             name: str,
             native_asset_symbol: str,
-            rpc_url: str,
+            rpc_urls: list[str],
             stargate_router_address: str,
             usdc_address: Optional[str],
             usdt_address: Optional[str],
@@ -20,26 +27,19 @@ class Chain:
             layer_zero_chain_id: int,
             bungee_chain_id: int,
             explorer: str,
-            gas: int
+            gas: int,
+            route_code: str,
+            bridge_token: Token,
+            stargate_routes: Optional[list[str]] = None,
+            bungee_refuel_supported: bool = True
     ):
         self.name = name
         self.native_asset_symbol = native_asset_symbol
-        self.w3 = AsyncWeb3(AsyncHTTPProvider(rpc_url))
-        self.stargate_router_address = self.w3.to_checksum_address(stargate_router_address)
-        self.stargate_contract = self.w3.eth.contract(address=self.stargate_router_address, abi=stargate_abi)
-        self.usdc_contract = (
-            self.w3.eth.contract(address=self.w3.to_checksum_address(usdc_address), abi=usdc_abi)
-            if usdc_address
-            else None
-        )
-        self.usdt_contract = (
-            self.w3.eth.contract(address=self.w3.to_checksum_address(usdt_address), abi=usdt_abi)
-            if usdt_address
-            else None
-        )
-        self.bungee_contract = self.w3.eth.contract(
-            address=self.w3.to_checksum_address(bungee_refuel_address), abi=bungee_refuel_abi
-        )
+        self.rpc_urls = rpc_urls  # reads go to the fastest healthy endpoint, transactions are sent to all of them
+        self.stargate_router_address = to_checksum_address(stargate_router_address)
+        self.usdc_address = to_checksum_address(usdc_address) if usdc_address else None
+        self.usdt_address = to_checksum_address(usdt_address) if usdt_address else None
+        self.bungee_refuel_address = to_checksum_address(bungee_refuel_address)
         self.layer_zero_chain_id = layer_zero_chain_id
         self.bungee_chain_id = bungee_chain_id
         self.explorer = explorer
@@ -47,12 +47,46 @@ class Chain:
         self.native_token_decimals = (
             18  # for all blockchains to be compatible with Solidity, native asset should have 18 decimals
         )
+        self.route_code = route_code  # short chain code used in CLI route names, e.g. "p" in "pa"
+        self.bridge_token = bridge_token  # token bridged from and received on this chain
+        self.stargate_routes = stargate_routes  # names of chains reachable via Stargate, None if all are
+        self.bungee_refuel_supported = bungee_refuel_supported
+
+    # Web3 instance and contracts are created on first use, so modes not touching a chain do not pay for them
+
+    @cached_property
+    def w3(self) -> AsyncWeb3:
+        return AsyncWeb3(RpcPoolProvider(self.rpc_urls, name=self.name))
+
+    @cached_property
+    def stargate_contract(self) -> AsyncContract:
+        return self.w3.eth.contract(address=self.stargate_router_address, abi=abi.stargate_abi)
+
+    @cached_property
+    def usdc_contract(self) -> Optional[AsyncContract]:
+        return self.w3.eth.contract(address=self.usdc_address, abi=abi.usdc_abi) if self.usdc_address else None
+
+    @cached_property
+    def usdt_contract(self) -> Optional[AsyncContract]:
+        return self.w3.eth.contract(address=self.usdt_address, abi=abi.usdt_abi) if self.usdt_address else None
+
+    @cached_property
+    def bungee_contract(self) -> AsyncContract:
+        return self.w3.eth.contract(address=self.bungee_refuel_address, abi=abi.bungee_refuel_abi)
+
+    @cached_property
+    def multicall_contract(self) -> AsyncContract:
+        return self.w3.eth.contract(address=MULTICALL3_ADDRESS, abi=abi.multicall3_abi)
+
+    @property
+    def bridge_token_contract(self) -> AsyncContract:
+        return getattr(self, f"{self.bridge_token.name.lower()}_contract")
 
 
 polygon = Chain(
     name="POLYGON",
     native_asset_symbol="MATIC",
-    rpc_url="https://polygon-rpc.com/",
+    rpc_urls=["https://polygon-rpc.com/", "https://rpc.ankr.com/polygon"],
     stargate_router_address="0x45A01E4e04F14f7A4a6702c74187c5F6222033cd",
     usdc_address=usdc.polygon_address,
     usdt_address=usdt.polygon_address,
@@ -60,13 +94,15 @@ polygon = Chain(
     layer_zero_chain_id=109,
     bungee_chain_id=137,
     explorer="polygonscan.com",
-    gas=500_000
+    gas=500_000,
+    route_code="p",
+    bridge_token=usdc
 )
 
 fantom = Chain(
     name="FANTOM",
     native_asset_symbol="FTM",
-    rpc_url="https://rpc.ftm.tools/",
+    rpc_urls=["https://rpc.ftm.tools/", "https://rpc.ankr.com/fantom"],
     stargate_router_address="0xAf5191B0De278C7286d6C7CC6ab6BB8A73bA2Cd6",
     usdc_address=usdc.fantom_address,
     usdt_address=None,
@@ -74,13 +110,17 @@ fantom = Chain(
     layer_zero_chain_id=112,
     bungee_chain_id=250,
     explorer="ftmscan.com",
-    gas=600_000
+    gas=600_000,
+    route_code="f",
+    bridge_token=usdc,
+    stargate_routes=["POLYGON", "AVALANCHE", "BSC"],
+    bungee_refuel_supported=False
 )
 
 avalanche = Chain(
     name="AVALANCHE",
     native_asset_symbol="AVAX",
-    rpc_url="https://api.avax.network/ext/bc/C/rpc",
+    rpc_urls=["https://api.avax.network/ext/bc/C/rpc", "https://rpc.ankr.com/avalanche"],
     stargate_router_address="0x45A01E4e04F14f7A4a6702c74187c5F6222033cd",
     usdc_address=usdc.avalanche_address,
     usdt_address=usdt.avalanche_address,
@@ -88,13 +128,15 @@ avalanche = Chain(
     layer_zero_chain_id=106,
     bungee_chain_id=43114,
     explorer="snowtrace.io",
-    gas=500_000
+    gas=500_000,
+    route_code="a",
+    bridge_token=usdc
 )
 
 bsc = Chain(
     name="BSC",
     native_asset_symbol="BNB",
-    rpc_url="https://bsc-dataseed1.defibit.io/",
+    rpc_urls=["https://bsc-dataseed1.defibit.io/", "https://bsc-dataseed.binance.org/"],
     stargate_router_address="0x4a364f8c717cAAD9A442737Eb7b8A55cc6cf18D8",
     usdc_address=None,
     bungee_refuel_address="0xbe51d38547992293c89cc589105784ab60b004a9",
@@ -102,13 +144,15 @@ bsc = Chain(
     layer_zero_chain_id=102,
     bungee_chain_id=56,
     explorer="bscscan.com",
-    gas=700_000
+    gas=700_000,
+    route_code="b",
+    bridge_token=usdt
 )
 
 arbitrum = Chain(
     name="ARBITRUM",
     native_asset_symbol="ETH",
-    rpc_url="https://rpc.ankr.com/arbitrum",
+    rpc_urls=["https://rpc.ankr.com/arbitrum", "https://arb1.arbitrum.io/rpc"],
     stargate_router_address="0x53Bf833A5d6c4ddA888F69c22C88C9f356a41614",
     usdc_address=usdc.arbitrum_address,
     bungee_refuel_address="0xc0E02AA55d10e38855e13B64A8E1387A04681A00",
@@ -116,13 +160,15 @@ arbitrum = Chain(
     layer_zero_chain_id=110,
     bungee_chain_id=42161,
     explorer="arbiscan.io",
-    gas=500_000
+    gas=500_000,
+    route_code="arb",
+    bridge_token=usdt
 )
 
 optimism = Chain(
     name="OPTIMISM",
     native_asset_symbol="ETH",
-    rpc_url="https://rpc.ankr.com/optimism",
+    rpc_urls=["https://rpc.ankr.com/optimism", "https://mainnet.optimism.io"],
     stargate_router_address="0xB0D502E938ed5f4df2E681fE6E419ff29631d62b",
     usdc_address=usdc.optimism_adress,
     bungee_refuel_address="0x5800249621DA520aDFdCa16da20d8A5Fc0f814d8",
@@ -130,13 +176,15 @@ optimism = Chain(
     layer_zero_chain_id=111,
     bungee_chain_id=10,
     explorer="optimistic.etherscan.io",
-    gas=700_000
+    gas=700_000,
+    route_code="o",
+    bridge_token=usdc
 )
 
 base = Chain(
     name="BASE",
     native_asset_symbol="ETH",
-    rpc_url="https://base.blockpi.network/v1/rpc/public",
+    rpc_urls=["https://base.blockpi.network/v1/rpc/public", "https://mainnet.base.org"],
     stargate_router_address="0x45f1A95A4D3f3836523F5c83673c797f4d4d263B",
     usdc_address=usdc.base_address,
     bungee_refuel_address="0x3a23F943181408EAC424116Af7b7790c94Cb97a5",
@@ -144,5 +192,9 @@ base = Chain(
     layer_zero_chain_id=184,
     bungee_chain_id=8453,
     explorer="basescan.org",
-    gas=700_000
+    gas=700_000,
+    route_code="base",
+    bridge_token=usdc
 )
+
+all_chains = [polygon, fantom, avalanche, bsc, arbitrum, optimism, base]
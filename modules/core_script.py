@@ -1,114 +1,206 @@
 import asyncio
 import random
+import time
 
-from tqdm import tqdm
+from web3.exceptions import TimeExhausted
 
-from config import PRIVATE_KEYS, TIMES
-from modules.chain_to_chain import chain_to_chain
+from config import PRIVATE_KEYS, START_DELAY_MAX, START_DELAY_MIN, TIMES
+from modules.chain_to_chain import bridge_route
 from modules.chains import avalanche, bsc, polygon
 from modules.custom_logger import logger
-from modules.tokens import usdc, usdt
+from modules.dashboard import DELAY, DONE, FAILED as LEG_FAILED, START_DELAY, dashboard
+from modules.journal import FAILED, FINISHED, SENT, STARTED, WAITING, journal
+from modules.routes import Route, routes_by_chains
+from modules.scheduler import Scheduler
 from modules.utils import wallet_public_address
 
+# Transfer cycle legs with the (min, max) delay in seconds after each of them
+CYCLE_LEGS: list[tuple[Route, tuple[int, int]]] = [
+    (routes_by_chains[(polygon.name, avalanche.name)], (1200, 1500)),
+    (routes_by_chains[(avalanche.name, bsc.name)], (1200, 1500)),
+    (routes_by_chains[(bsc.name, polygon.name)], (100, 300)),
+]
 
-async def draw_tqdm(delay: int, desc: str) -> None:
-    """Draw a CLI progress bar"""
-    with tqdm(total=delay, desc=desc, bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt}") as pbar:
-        for _ in range(delay):
-            await asyncio.sleep(1)
-            pbar.update(1)
 
+class _Position:
+    """Point of the transfer cycle a wallet starts or resumes from"""
 
-async def work(wallet: str) -> None:
-    """Transfer cycle function. It sends USDC from Polygon to Avalanche and then to BSC as USDT.
-    From BSC USDT tokens are bridged to Polygon into USDC.
-    It runs such cycle N times, where N - number of cycles specified if config.py
+    def __init__(self, cycle: int = 0, leg: int = 0, leg_done: bool = False, delay_until: float = 0):
+        self.cycle = cycle
+        self.leg = leg
+        self.leg_done = leg_done  # only the delay after the leg is left
+        self.delay_until = delay_until
+
+
+async def _is_transaction_successful(route: Route, tx_hash: str) -> bool | None:
+    """Get a sent leg transaction status. A leg sent right before the interruption may be still pending,
+    so its receipt is waited for. None if the transaction is not in the chain after the wait
+    """
+    try:
+        receipt = await route.from_chain.w3.eth.wait_for_transaction_receipt(tx_hash, poll_latency=2)
+    except TimeExhausted:
+        return None
+
+    return receipt["status"] == 1
+
+
+async def _resume_positions(addresses: list[str]) -> dict[str, _Position | None]:
+    """Rebuild wallet positions from the run journal. Receipts of all sent legs are checked at once.
+    Finished wallets get None
 
     Args:
-        wallet: wallet address
+        addresses:  wallet public addresses
     """
-    counter = 0
+    states = journal.load()
+    positions: dict[str, _Position | None] = {}
+    sent: dict[str, dict] = {}
+
+    for address in addresses:
+        state = states.get(address)
+        if state is None:
+            positions[address] = _Position()
+        elif state["state"] == FINISHED:
+            positions[address] = None
+        elif state["state"] == WAITING:
+            positions[address] = _Position(
+                cycle=state["cycle"], leg=state["leg"], leg_done=True, delay_until=state["until"]
+            )
+        elif state["state"] == SENT:
+            sent[address] = state
+        else:  # STARTED or FAILED, the leg is bridged again after the balance check
+            positions[address] = _Position(cycle=state["cycle"], leg=state["leg"])
+
+    statuses = await asyncio.gather(
+        *[
+            _is_transaction_successful(route=CYCLE_LEGS[state["leg"]][0], tx_hash=state["tx"])
+            for state in sent.values()
+        ],
+        return_exceptions=True,
+    )
+    for (address, state), status in zip(sent.items(), statuses):
+        if status is True:
+            positions[address] = _Position(cycle=state["cycle"], leg=state["leg"], leg_done=True)
+        else:
+            logger.warning(
+                f"RESUME | {address} | Leg transaction {state['tx']} is not successful ({status!r}), bridging again"
+            )
+            positions[address] = _Position(cycle=state["cycle"], leg=state["leg"])
+
+    finished = sum(position is None for position in positions.values())
+    logger.info(f"RESUME | {finished} of {len(addresses)} wallets are finished, {len(sent)} sent legs checked")
+    return positions
+
+
+def _schedule(scheduler: Scheduler, wallet: str, position: _Position, delay: int = 0) -> int:
+    """Schedule the next step of a wallet. A leg to bridge gets a random start delay on top of delay.
+    Returns the total delay in seconds
+    """
+    if position.cycle < TIMES and not position.leg_done:
+        start_delay = random.randint(START_DELAY_MIN, START_DELAY_MAX)
+        logger.info(f"START DELAY | {wallet_public_address(wallet)} | Waiting for {start_delay} seconds.")
+        delay += start_delay
+
+    scheduler.schedule(wallet_public_address(wallet), lambda: _step(scheduler, wallet, position), delay=delay)
+    return delay
+
 
+async def _step(scheduler: Scheduler, wallet: str, position: _Position) -> None:
+    """Transfer cycle step. It bridges the current leg of the cycle and schedules the next one after the leg delay.
+    The cycle sends USDC from Polygon to Avalanche and then to BSC as USDT.
+    From BSC USDT tokens are bridged to Polygon into USDC.
+    It runs such cycle N times, where N - number of cycles specified if config.py.
+    Progress is recorded to the run journal.
+
+    Args:
+        scheduler:  scheduler of the run
+        wallet:     wallet private key
+        position:   cycle point of the wallet
+    """
     address = wallet_public_address(wallet)
 
-    while counter < TIMES:
+    if position.cycle == TIMES:
+        journal.record(address, FINISHED)
+        dashboard.update(address, DONE)
+        logger.success(f"DONE | {address}")
+        return
 
-        is_sent = await chain_to_chain(
+    route, (delay_min, delay_max) = CYCLE_LEGS[position.leg]
+
+    if not position.leg_done:
+        journal.record(address, STARTED, cycle=position.cycle, leg=position.leg)
+
+        # Only the first leg stops on zero balance, later ones wait for tokens of the previous leg.
+        # The start delay is waited out by the scheduler, so a waiting wallet holds no worker.
+        # The leg is journaled as sent before its receipt wait, so resume checks legs that were in flight
+        tx_hash = await bridge_route(
             wallet=wallet,
-            from_chain_name=polygon.name,
-            token=usdc.name,
-            token_from_chain_contract=polygon.usdc_contract,
-            to_chain_name=avalanche.name,
-            from_chain=polygon,
-            destination_chain_id=avalanche.layer_zero_chain_id,
-            source_pool_id=usdc.stargate_pool_id,
-            dest_pool_id=usdc.stargate_pool_id,
-            stargate_from_chain_contract=polygon.stargate_contract,
-            stargate_from_chain_address=polygon.stargate_router_address,
-            from_chain_explorer=polygon.explorer,
-            gas=polygon.gas,
+            route=route,
+            stop_if_zero=position.leg == 0,
+            wait_start_delay=False,
+            on_sent=lambda sent_hash: journal.record(
+                address, SENT, cycle=position.cycle, leg=position.leg, tx=sent_hash
+            ),
         )
 
-        if not is_sent:
+        # No tx hash is returned if the balance is still zero after the wait (BALANCE_WAIT_TIMEOUT for later legs),
+        # the amount to bridge is zero or the swap arguments could not be encoded. All of them are journaled
+        # as failed and --resume bridges the leg again, which fails the same way until the wallet is fixed
+        if not tx_hash:
+            journal.record(address, FAILED, cycle=position.cycle, leg=position.leg)
+            dashboard.update(address, LEG_FAILED)
             logger.error(
-                f"FAILED TO SEND FROM THE FIRST CHAIN | {address} | "
-                f"Source: {polygon.name}, destination chain: {avalanche.name}"
+                f"FAILED TO SEND FROM {'THE FIRST CHAIN' if position.leg == 0 else route.from_chain.name.upper()} | "
+                f"{address} | Source: {route.from_chain.name}, destination chain: {route.to_chain.name}"
             )
-            break
-
-        polygon_delay = random.randint(1200, 1500)
-        logger.info(f"POLYGON DELAY | {address} | Waiting for {polygon_delay} seconds.")
-        await draw_tqdm(delay=polygon_delay, desc=f"Waiting POLYGON DELAY | {address}")
+            logger.success(f"DONE | {address}")
+            return
 
-        await chain_to_chain(
-            wallet=wallet,
-            from_chain_name=avalanche.name,
-            token=usdc.name,
-            token_from_chain_contract=avalanche.usdc_contract,
-            to_chain_name=bsc.name,
-            from_chain=avalanche,
-            destination_chain_id=bsc.layer_zero_chain_id,
-            source_pool_id=usdc.stargate_pool_id,
-            dest_pool_id=usdt.stargate_pool_id,
-            stargate_from_chain_contract=avalanche.stargate_contract,
-            stargate_from_chain_address=avalanche.stargate_router_address,
-            from_chain_explorer=avalanche.explorer,
-            gas=avalanche.gas,
-            stop_if_zero=False
-        )
+        position.delay_until = time.time() + random.randint(delay_min, delay_max)
+        journal.record(address, WAITING, cycle=position.cycle, leg=position.leg, until=position.delay_until)
 
-        avalanche_delay = random.randint(1200, 1500)
-        logger.info(f"AVALANCHE DELAY | {address} | Waiting for {avalanche_delay} seconds.")
-        await draw_tqdm(delay=polygon_delay, desc=f"Waiting AVALANCHE DELAY | {address}")
+    delay = max(0, round(position.delay_until - time.time()))
+    logger.info(f"{route.from_chain.name} DELAY | {address} | Waiting for {delay} seconds.")
 
-        await chain_to_chain(
-            wallet=wallet,
-            from_chain_name=bsc.name,
-            token=usdt.name,
-            token_from_chain_contract=bsc.usdt_contract,
-            to_chain_name=polygon.name,
-            from_chain=bsc,
-            destination_chain_id=polygon.layer_zero_chain_id,
-            source_pool_id=usdt.stargate_pool_id,
-            dest_pool_id=usdc.stargate_pool_id,
-            stargate_from_chain_contract=bsc.stargate_contract,
-            stargate_from_chain_address=bsc.stargate_router_address,
-            from_chain_explorer=bsc.explorer,
-            gas=bsc.gas,
-            stop_if_zero=False
-        )
+    position.leg_done = False
+    position.leg += 1
+    if position.leg == len(CYCLE_LEGS):
+        position.leg = 0
+        position.cycle += 1
 
-        bsc_delay = random.randint(100, 300)
-        logger.info(f"BSC DELAY | {address} | Waiting for {bsc_delay} seconds.")
-        await draw_tqdm(delay=polygon_delay, desc=f"Waiting BSC DELAY | {address}")
+    dashboard.update(address, DELAY, leg=route.name, delay=_schedule(scheduler, wallet, position, delay))
 
-        counter += 1
 
-    logger.success(f"DONE | {address}")
+async def main(resume: bool = False):
+    """Run transfer cycles for all wallets
 
+    Args:
+        resume:     continue the previous run from the run journal instead of starting from the first cycle
+    """
+    if resume:
+        positions = await _resume_positions([wallet_public_address(wallet) for wallet in PRIVATE_KEYS])
+        wallets = [
+            (wallet, positions[wallet_public_address(wallet)])
+            for wallet in PRIVATE_KEYS
+            if positions[wallet_public_address(wallet)] is not None
+        ]
+    else:
+        journal.start_run()
+        wallets = [(wallet, None) for wallet in PRIVATE_KEYS]
+
+    # Wallets wait in the scheduler heap instead of a coroutine each, legs are bridged by a bounded worker pool
+    scheduler = Scheduler()
+    for wallet, position in wallets:
+        position = position or _Position()
+        delay = _schedule(scheduler, wallet, position)
+        dashboard.update(
+            wallet_public_address(wallet),
+            DELAY if position.leg_done else START_DELAY,
+            leg=CYCLE_LEGS[position.leg][0].name,
+            delay=delay,
+        )
 
-async def main():
-    await asyncio.gather(*[work(wallet) for wallet in PRIVATE_KEYS], return_exceptions=True)
+    async with dashboard.show(scheduler=scheduler):
+        await scheduler.run()
 
     logger.success("*** FINISHED ***")
 
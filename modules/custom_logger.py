@@ -3,5 +3,8 @@ import sys
 
 from loguru import logger
 
+from modules.dashboard import dashboard
+
 logger.remove()
-logger.add(sys.stderr, format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <lvl>{level}</lvl> | <lvl>{message}</lvl>")
+# Messages go through the dashboard, so they are printed above its view
+logger.add(dashboard.write, colorize=sys.stderr.isatty(), format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <lvl>{level}</lvl> | <lvl>{message}</lvl>")
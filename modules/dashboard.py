@@ -0,0 +1,179 @@
+"""Aggregated progress dashboard of all wallets"""
+import asyncio
+import heapq
+import sys
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, TextIO
+
+from prettytable import PrettyTable
+
+from config import DASHBOARD_REFRESH_SECONDS, DASHBOARD_ROWS
+
+if TYPE_CHECKING:  # the scheduler logs through the dashboard
+    from modules.scheduler import Scheduler
+
+START_DELAY = "start delay"  # waiting before the leg
+BALANCE_WAIT = "balance wait"  # waiting for tokens to arrive
+BRIDGING = "bridging"  # building, sending and confirming the leg transaction
+SENT = "sent"  # leg transaction is confirmed
+DELAY = "delay"  # waiting after the leg
+STOPPED = "stopped"  # zero balance, nothing was sent
+FAILED = "failed"
+DONE = "done"  # all cycles are done
+
+PHASES = [START_DELAY, BALANCE_WAIT, BRIDGING, SENT, DELAY, STOPPED, FAILED, DONE]
+# Wallets doing work are listed first, then waiting ones by remaining delay, then finished ones
+_PHASE_ORDER = {BRIDGING: 0, BALANCE_WAIT: 0, START_DELAY: 1, DELAY: 1, SENT: 2, STOPPED: 2, FAILED: 2, DONE: 2}
+
+
+class _WalletStatus:
+    __slots__ = ("phase", "leg", "until", "tx")
+
+    def __init__(self):
+        self.phase = START_DELAY
+        self.leg = "-"
+        self.until: float | None = None  # monotonic time the current wait ends at
+        self.tx = "-"
+
+
+class Dashboard:
+    """One status view of all wallets redrawn at a fixed rate by a single task, instead of a progress bar per wallet.
+    Wallet coroutines only report phase changes and sleep through their delays at once.
+    On a terminal the view is redrawn in place with log messages printed above it.
+    Otherwise only the phase counts line is printed, and only when it changes.
+    """
+
+    def __init__(
+        self,
+        refresh_seconds: float = DASHBOARD_REFRESH_SECONDS,
+        rows: int = DASHBOARD_ROWS,
+        stream: TextIO = sys.stderr,
+    ):
+        self.refresh_seconds = refresh_seconds
+        self.rows = rows
+        self.stream = stream
+        self.is_terminal = stream.isatty()
+        self._wallets: dict[str, _WalletStatus] = {}
+        self._active = False
+        self._scheduler: "Scheduler | None" = None  # scheduler of the shown run
+        self._view = ""  # last drawn view
+        self._drawn_lines = 0  # lines of the view currently on the terminal
+
+    def update(
+        self, address: str, phase: str, leg: str | None = None, delay: float | None = None, tx: str | None = None
+    ) -> None:
+        """Report a wallet phase change
+
+        Args:
+            address:    wallet public address
+            phase:      new phase, e.g. DELAY
+            leg:        current leg route, kept from the previous update if not set
+            delay:      seconds the phase is going to take, if it is a wait
+            tx:         last sent transaction hash, kept from the previous update if not set
+        """
+        status = self._wallets.get(address)
+        if status is None:
+            status = self._wallets[address] = _WalletStatus()
+
+        status.phase = phase
+        status.until = time.monotonic() + delay if delay is not None else None
+        if leg is not None:
+            status.leg = leg
+        if tx is not None:
+            status.tx = tx
+
+    def _summary(self) -> str:
+        counts = Counter(status.phase for status in self._wallets.values())
+        summary = f"WALLETS {len(self._wallets)} | " + " | ".join(
+            f"{phase} {counts[phase]}" for phase in PHASES if counts[phase]
+        )
+        if self._scheduler is not None:
+            summary += (
+                f" | WORKERS {self._scheduler.running}/{self._scheduler.workers} | QUEUED {self._scheduler.waiting}"
+            )
+        return summary
+
+    def render(self) -> str:
+        """Get the phase counts line and a table of the first wallets to finish their current phase"""
+        now = time.monotonic()
+        table = PrettyTable()
+        table.field_names = ["Wallet", "Leg", "Phase", "Left s", "Last tx"]
+
+        shown = heapq.nsmallest(
+            self.rows,
+            self._wallets.items(),
+            key=lambda item: (_PHASE_ORDER[item[1].phase], item[1].until or 0),
+        )
+        for address, status in shown:
+            table.add_row(
+                [
+                    address,
+                    status.leg,
+                    status.phase,
+                    max(0, round(status.until - now)) if status.until is not None else "-",
+                    f"{status.tx[:10]}...{status.tx[-4:]}" if len(status.tx) > 16 else status.tx,
+                ]
+            )
+
+        hidden = len(self._wallets) - len(shown)
+        return f"{self._summary()}\n{table}" + (f"\n... and {hidden} more wallets" if hidden else "")
+
+    def _erase(self) -> None:
+        if self._drawn_lines:
+            self.stream.write(f"\x1b[{self._drawn_lines}F\x1b[J")  # move to the view start and clear to the end
+            self._drawn_lines = 0
+
+    def _draw(self, view: str) -> None:
+        self.stream.write(view + "\n")
+        self._drawn_lines = view.count("\n") + 1
+        self.stream.flush()
+
+    def refresh(self) -> None:
+        """Draw the current view"""
+        if self.is_terminal:
+            self._view = self.render()
+            self._erase()
+            self._draw(self._view)
+        elif (summary := self._summary()) != self._view:
+            self._view = summary
+            self.stream.write(summary + "\n")
+            self.stream.flush()
+
+    def write(self, message: str) -> None:
+        """Print a message above the view. Used as the logger sink"""
+        if self._active and self.is_terminal and self._view:
+            self._erase()
+            self.stream.write(message)
+            self._draw(self._view)
+        else:
+            self.stream.write(message)
+            self.stream.flush()
+
+    async def _run(self) -> None:
+        while True:
+            self.refresh()
+            await asyncio.sleep(self.refresh_seconds)
+
+    @asynccontextmanager
+    async def show(self, scheduler: "Scheduler | None" = None) -> AsyncIterator[None]:
+        """Keep the view refreshed while the block runs. The final view is left on screen
+
+        Args:
+            scheduler:  scheduler of the run, its busy workers and queued jobs are added to the phase counts line
+        """
+        self._active = True
+        self._scheduler = scheduler
+        task = asyncio.create_task(self._run())
+        try:
+            yield
+        finally:
+            task.cancel()
+            self.refresh()
+            self._active = False
+            self._scheduler = None
+            self._drawn_lines = 0
+
+
+dashboard = Dashboard()
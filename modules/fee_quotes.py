@@ -0,0 +1,115 @@
+"""LayerZero fee quote matrix with block-scoped caching"""
+import asyncio
+import time
+
+from hexbytes import HexBytes
+from web3.contract import AsyncContract
+
+from config import FEE_QUOTE_MAX_BLOCKS, FEE_QUOTE_TTL
+from modules.block_poller import get_block_poller
+from modules.calldata import call, stargate_function
+from modules.chains import Chain
+from modules.custom_logger import logger
+from modules.routes import Route, stargate_routes
+from modules.single_flight import SingleFlight
+
+
+async def quote_layer_zero_fee(stargate_from_chain_contract: AsyncContract, destination_chain_id: int) -> int:
+    """Get LayerZero fee in native asset wei for a swap to the destination chain.
+    The fee does not depend on the wallet, so a dummy payload is quoted.
+
+    Args:
+        stargate_from_chain_contract:   Sending chain stargate router contract
+        destination_chain_id:           Destination chain id from stargate docs
+    """
+    fees = await call(
+        stargate_from_chain_contract.w3,
+        stargate_from_chain_contract.address,
+        stargate_function("quoteLayerZeroFee"),
+        destination_chain_id,  # uint16 _dstChainId
+        1,  # uint8 _functionType
+        HexBytes("0x0000000000000000000000000000000000001010"),  # bytes calldata _toAddress
+        b"",  # bytes calldata _transferAndCallPayload
+        (0, 0, HexBytes("0x0000000000000000000000000000000000000001"))  # Router.lz_tx_obj memory _lzTxParams
+    )
+    return fees[0]
+
+
+class _FeeQuote:
+    def __init__(self, fee: int, block: int | None):
+        self.fee = fee
+        self.block = block
+        self.fetched_at = time.monotonic()
+
+
+class FeeQuoteService:
+    """LayerZero fees of all (source chain, destination chain) pairs shared by all wallets.
+    A quote is reused for ttl seconds, or for max_blocks blocks while the source chain block poller runs.
+    Concurrent callers share one in-flight quote.
+    """
+
+    def __init__(self, routes: list[Route], ttl: float = FEE_QUOTE_TTL, max_blocks: int = FEE_QUOTE_MAX_BLOCKS):
+        self.routes = routes
+        self.ttl = ttl
+        self.max_blocks = max_blocks
+        self._quotes: dict[tuple[str, int], _FeeQuote] = {}
+        self._flights = SingleFlight()
+
+    def _is_fresh(self, from_chain: Chain, quote: _FeeQuote | None) -> bool:
+        if quote is None or time.monotonic() - quote.fetched_at >= self.ttl:
+            return False
+
+        block_poller = get_block_poller(from_chain)
+        if block_poller.is_running and quote.block is not None:
+            return block_poller.latest_block - quote.block < self.max_blocks
+
+        return True
+
+    async def _quote(self, from_chain: Chain, destination_chain_id: int) -> int:
+        block = get_block_poller(from_chain).latest_block
+        fee = await quote_layer_zero_fee(
+            stargate_from_chain_contract=from_chain.stargate_contract, destination_chain_id=destination_chain_id
+        )
+        self._quotes[(from_chain.name, destination_chain_id)] = _FeeQuote(fee=fee, block=block)
+        return fee
+
+    async def get(self, from_chain: Chain, destination_chain_id: int) -> int:
+        """Get LayerZero fee in native asset wei for a swap from a chain to the destination chain
+
+        Args:
+            from_chain:             sending chain
+            destination_chain_id:   destination chain id from stargate docs
+        """
+        key = (from_chain.name, destination_chain_id)
+        if self._is_fresh(from_chain, self._quotes.get(key)):
+            return self._quotes[key].fee
+
+        return await self._flights.do(
+            key, lambda: self._quote(from_chain=from_chain, destination_chain_id=destination_chain_id)
+        )
+
+    def invalidate(self, from_chain: Chain, destination_chain_id: int) -> None:
+        """Drop a cached quote, so the next caller quotes again. Used when a swap with the quoted fee failed
+
+        Args:
+            from_chain:             sending chain
+            destination_chain_id:   destination chain id from stargate docs
+        """
+        self._quotes.pop((from_chain.name, destination_chain_id), None)
+
+    async def warm_up(self) -> None:
+        """Quote all routes in parallel. Failed quotes are logged and quoted again on first use"""
+        results = await asyncio.gather(
+            *[
+                self.get(from_chain=route.from_chain, destination_chain_id=route.destination_chain_id)
+                for route in self.routes
+            ],
+            return_exceptions=True,
+        )
+
+        for route, result in zip(self.routes, results):
+            if isinstance(result, Exception):
+                logger.warning(f"FEES | Could not quote LayerZero fee for {route.name}: {result!r}")
+
+
+fee_quote_service = FeeQuoteService(routes=list(stargate_routes.values()))
@@ -0,0 +1,63 @@
+"""Shared per-chain gas price cache"""
+import time
+
+from config import GAS_PRICE_MAX_AGE
+from modules.block_poller import get_block_poller
+from modules.chains import Chain
+from modules.custom_logger import logger
+from modules.single_flight import SingleFlight
+
+
+class GasPriceService:
+    """Gas price of one chain served from memory to all transaction builders.
+    While the chain block poller runs, the price is refreshed at most once per new block,
+    otherwise it is refreshed when older than max_age seconds.
+    """
+
+    def __init__(self, chain: Chain, max_age: float = GAS_PRICE_MAX_AGE):
+        self.chain = chain
+        self.max_age = max_age
+        self.value: int | None = None
+        self._block: int | None = None
+        self._fetched_at: float | None = None
+        self._flights = SingleFlight()
+
+    @property
+    def age(self) -> float | None:
+        """Seconds since the current value was fetched. None if nothing was fetched yet"""
+        return time.monotonic() - self._fetched_at if self._fetched_at is not None else None
+
+    def _is_fresh(self) -> bool:
+        if self.value is None:
+            return False
+
+        block_poller = get_block_poller(self.chain)
+        if block_poller.is_running:
+            return self._block == block_poller.latest_block
+
+        return self.age < self.max_age
+
+    async def _refresh(self) -> None:
+        block = get_block_poller(self.chain).latest_block
+        self.value = await self.chain.w3.eth.gas_price
+        self._block = block
+        self._fetched_at = time.monotonic()
+        logger.debug(f"GAS | {self.chain.name} | Gas price is {self.value / 10**9} gwei")
+
+    async def get(self) -> int:
+        """Get current gas price. Concurrent callers share one in-flight request"""
+        if self._is_fresh():
+            return self.value
+
+        await self._flights.do("gas_price", self._refresh)
+        return self.value
+
+
+_gas_price_services: dict[str, GasPriceService] = {}
+
+
+def get_gas_price_service(chain: Chain) -> GasPriceService:
+    """Get the gas price service of a chain. Services are created once per chain"""
+    if chain.name not in _gas_price_services:
+        _gas_price_services[chain.name] = GasPriceService(chain=chain)
+    return _gas_price_services[chain.name]
@@ -0,0 +1,89 @@
+"""Process-wide pooled HTTP session shared by all RPC and REST traffic"""
+import asyncio
+
+import aiohttp
+
+from config import (
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_TIMEOUT,
+)
+from modules import metrics
+from modules.cassette import cassette
+from modules.custom_logger import logger
+
+
+class SessionManager:
+    """Owner of one aiohttp session with per-host connection pools, keep-alive and DNS caching.
+    Every request of the session is recorded to HTTP metrics.
+    """
+
+    def __init__(
+        self,
+        limit: int = HTTP_POOL_LIMIT,
+        limit_per_host: int = HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout: float = HTTP_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl: int = HTTP_DNS_CACHE_TTL,
+        timeout: float = HTTP_TIMEOUT,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = timeout
+        self._session: aiohttp.ClientSession | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def get(self) -> aiohttp.ClientSession:
+        """Get the shared session. It is created on first use inside the running event loop.
+        While a cassette is recorded or replayed, the session is wrapped or replaced by the cassette one
+        """
+        if cassette.replaying:
+            return cassette.session(None)
+
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                trace_configs=[metrics.trace_config()],
+            )
+            self._loop = loop
+        return cassette.session(self._session) if cassette.recording else self._session
+
+    async def warm_up(self, urls: list[str], timeout: float = 5) -> None:
+        """Open keep-alive connections to the given hosts, so the first real request skips TCP and TLS handshakes.
+        Any response status is fine here, only the connection matters.
+
+        Args:
+            urls:       list of urls to connect to
+            timeout:    max seconds to wait for one host
+        """
+        session = self.get()
+
+        async def _connect(url: str) -> None:
+            try:
+                async with session.head(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.debug(f"HTTP | Could not warm up connection to {url}: {e!r}")
+
+        await asyncio.gather(*[_connect(url) for url in set(urls)])
+
+    async def close(self) -> None:
+        """Close the shared session and all pooled connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+session_manager = SessionManager()
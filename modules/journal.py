@@ -0,0 +1,68 @@
+"""Crash-safe append-only run journal in JSON lines format"""
+import json
+import os
+import time
+
+from config import JOURNAL_PATH
+
+RUN = "run"  # marker of a new run, earlier records are ignored on resume
+STARTED = "started"  # leg is being bridged
+SENT = "sent"  # leg transaction is sent, "tx" holds its hash
+WAITING = "waiting"  # leg is done, wallet waits until "until" timestamp before the next leg
+FAILED = "failed"  # wallet stopped, nothing was bridged
+FINISHED = "finished"  # all cycles are done
+
+
+class RunJournal:
+    """Journal of wallet progress. Every record is flushed to disk before the run continues,
+    so a killed run can be resumed from the last recorded state of each wallet.
+    Wallets are recorded by public address only.
+    """
+
+    def __init__(self, path: str = JOURNAL_PATH):
+        self.path = path
+
+    def _append(self, record: dict) -> None:
+        with open(self.path, "a") as file:
+            file.write(json.dumps(record) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def start_run(self) -> None:
+        """Mark the start of a new run. States recorded before it are not resumed"""
+        self._append({"state": RUN, "time": time.time()})
+
+    def record(self, wallet: str, state: str, cycle: int | None = None, leg: int | None = None, **fields) -> None:
+        """Append wallet state
+
+        Args:
+            wallet:     wallet public address
+            state:      one of journal states
+            cycle:      transfer cycle number
+            leg:        leg number in the cycle
+            fields:     extra state fields, e.g. tx hash
+        """
+        self._append({"wallet": wallet, "state": state, "cycle": cycle, "leg": leg, "time": time.time(), **fields})
+
+    def load(self) -> dict[str, dict]:
+        """Get the last recorded state of each wallet in the current run"""
+        states: dict[str, dict] = {}
+        if not os.path.exists(self.path):
+            return states
+
+        with open(self.path) as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:  # the last line could be cut off by a crash
+                    continue
+
+                if record["state"] == RUN:
+                    states.clear()
+                else:
+                    states[record["wallet"]] = record
+
+        return states
+
+
+journal = RunJournal()
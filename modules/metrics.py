@@ -0,0 +1,187 @@
+"""In-process metrics of RPC and HTTP traffic with Prometheus text exposition"""
+import bisect
+import time
+from types import SimpleNamespace
+
+import aiohttp
+from aiohttp import web
+from prettytable import PrettyTable
+
+# Upper bounds of latency histogram buckets in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class Counter:
+    def __init__(self, name: str, description: str, label_names: tuple[str, ...]):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, value: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        for labels, value in self.values.items():
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    def dec(self, *labels: str, value: float = 1) -> None:
+        self.inc(*labels, value=-value)
+
+    def render(self) -> list[str]:
+        return [line.replace(" counter", " gauge") if line.startswith("# TYPE") else line for line in super().render()]
+
+
+class _HistogramSeries:
+    def __init__(self, buckets_number: int):
+        self.buckets = [0] * buckets_number
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+
+class Histogram:
+    def __init__(
+        self, name: str, description: str, label_names: tuple[str, ...], buckets: tuple[float, ...] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.bounds = buckets
+        self.series: dict[tuple[str, ...], _HistogramSeries] = {}
+
+    def observe(self, *labels: str, value: float) -> None:
+        if labels not in self.series:
+            self.series[labels] = _HistogramSeries(len(self.bounds))
+        series = self.series[labels]
+        index = bisect.bisect_left(self.bounds, value)
+        if index < len(self.bounds):
+            series.buckets[index] += 1
+        series.count += 1
+        series.sum += value
+        series.max = max(series.max, value)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for labels, series in self.series.items():
+            cumulative = 0
+            for bound, bucket in zip(self.bounds, series.buckets):
+                cumulative += bucket
+                bucket_labels = _format_labels(self.label_names + ("le",), labels + (str(bound),))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            inf_labels = _format_labels(self.label_names + ("le",), labels + ("+Inf",))
+            lines.append(f"{self.name}_bucket{inf_labels} {series.count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {series.sum}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {series.count}")
+        return lines
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    escaped = [str(value).replace("\\", "\\\\").replace('"', '\\"') for value in values]
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+rpc_latency = Histogram("rpc_request_duration_seconds", "JSON-RPC call latency", ("chain", "method"))
+rpc_errors = Counter("rpc_errors_total", "Failed JSON-RPC calls and error responses", ("chain", "method"))
+rpc_in_flight = Gauge("rpc_in_flight", "JSON-RPC calls waiting for a response", ("chain",))
+http_latency = Histogram("http_request_duration_seconds", "HTTP request latency", ("host",))
+http_responses = Counter("http_responses_total", "HTTP responses by status", ("host", "status"))
+http_errors = Counter("http_errors_total", "HTTP requests failed without a response", ("host",))
+http_in_flight = Gauge("http_in_flight", "HTTP requests waiting for a response", ("host",))
+
+METRICS = [rpc_latency, rpc_errors, rpc_in_flight, http_latency, http_responses, http_errors, http_in_flight]
+
+
+def render() -> str:
+    """Get all metrics in Prometheus text exposition format"""
+    return "\n".join(line for metric in METRICS for line in metric.render()) + "\n"
+
+
+def trace_config() -> aiohttp.TraceConfig:
+    """aiohttp tracing hooks recording every request of a session"""
+
+    async def on_request_start(
+        session: aiohttp.ClientSession, context: SimpleNamespace, params: aiohttp.TraceRequestStartParams
+    ) -> None:
+        context.host = params.url.host
+        context.started = time.monotonic()
+        http_in_flight.inc(context.host)
+
+    async def on_request_end(
+        session: aiohttp.ClientSession, context: SimpleNamespace, params: aiohttp.TraceRequestEndParams
+    ) -> None:
+        http_in_flight.dec(context.host)
+        http_latency.observe(context.host, value=time.monotonic() - context.started)
+        http_responses.inc(context.host, str(params.response.status))
+
+    async def on_request_exception(
+        session: aiohttp.ClientSession, context: SimpleNamespace, params: aiohttp.TraceRequestExceptionParams
+    ) -> None:
+        http_in_flight.dec(context.host)
+        http_errors.inc(context.host)
+
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(on_request_start)
+    config.on_request_end.append(on_request_end)
+    config.on_request_exception.append(on_request_exception)
+    return config
+
+
+async def start_server(port: int, host: str = "127.0.0.1") -> web.AppRunner:
+    """Serve metrics on http://host:port/metrics. The returned runner should be cleaned up on exit"""
+
+    async def handle_metrics(request: web.Request) -> web.Response:
+        return web.Response(text=render(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def summary_table() -> str:
+    """Get per chain and method RPC and per host HTTP stats as printable tables. Empty if nothing was recorded"""
+    if not rpc_latency.series and not http_latency.series and not http_errors.values:
+        return ""
+
+    rpc_table = PrettyTable()
+    rpc_table.field_names = ["Chain", "Method", "Calls", "Errors", "Avg ms", "Max ms"]
+    for (chain, method), series in sorted(rpc_latency.series.items()):
+        rpc_table.add_row(
+            [
+                chain,
+                method,
+                series.count,
+                int(rpc_errors.values.get((chain, method), 0)),
+                round(series.sum / series.count * 1000),
+                round(series.max * 1000),
+            ]
+        )
+
+    http_table = PrettyTable()
+    http_table.field_names = ["Host", "Requests", "429", "Other errors", "Avg ms", "Max ms"]
+    for host in sorted({host for (host,) in http_latency.series} | {host for (host,) in http_errors.values}):
+        series = http_latency.series.get((host,))
+        failed_statuses = sum(
+            value
+            for (response_host, status), value in http_responses.values.items()
+            if response_host == host and status != "429" and int(status) >= 400
+        )
+        http_table.add_row(
+            [
+                host,
+                series.count if series else 0,
+                int(http_responses.values.get((host, "429"), 0)),
+                int(failed_statuses + http_errors.values.get((host,), 0)),
+                round(series.sum / series.count * 1000) if series else "-",
+                round(series.max * 1000) if series else "-",
+            ]
+        )
+
+    return f"{rpc_table}\n{http_table}"
@@ -0,0 +1,60 @@
+"""Multicall3 batching helpers
+    Docs: https://github.com/mds1/multicall
+"""
+import asyncio
+
+from web3.contract import AsyncContract
+
+from config import MULTICALL_BATCH_SIZE
+from modules.calldata import call, erc20_function, multicall3_function
+from modules.chains import MULTICALL3_ADDRESS, Chain
+
+
+async def aggregate3(
+    chain: Chain, calls: list[tuple[str, bytes]], batch_size: int = MULTICALL_BATCH_SIZE
+) -> list[bytes | None]:
+    """Execute read-only calls through Multicall3 aggregate3, batch_size calls per eth_call.
+    Batches are sent concurrently. Failed calls are returned as None.
+
+    Args:
+        chain:          blockchain to query
+        calls:          list of (target contract address, calldata)
+        batch_size:     max number of calls in one aggregate3 request
+    """
+    batches = [calls[i:i + batch_size] for i in range(0, len(calls), batch_size)]
+
+    aggregate3_function = multicall3_function("aggregate3")
+    results = await asyncio.gather(
+        *[
+            call(
+                chain.w3,
+                MULTICALL3_ADDRESS,
+                aggregate3_function,
+                [(target, True, call_data) for target, call_data in batch],
+            )
+            for batch in batches
+        ]
+    )
+
+    return [return_data if success else None for (batch,) in results for success, return_data in batch]
+
+
+async def get_token_balances(
+    chain: Chain, token_contract: AsyncContract, wallets: list[str], batch_size: int = MULTICALL_BATCH_SIZE
+) -> dict[str, int | None]:
+    """Get raw token balances of all wallets on a chain with batched balanceOf calls
+
+    Args:
+        chain:              blockchain to query
+        token_contract:     web3 token contract on the chain
+        wallets:            list of public addresses
+        batch_size:         max number of balanceOf calls in one aggregate3 request
+    """
+    balance_of = erc20_function("balanceOf")
+    calls = [(token_contract.address, balance_of.encode(wallet)) for wallet in wallets]
+    results = await aggregate3(chain=chain, calls=calls, batch_size=batch_size)
+
+    return {
+        wallet: balance_of.decode(return_data)[0] if return_data else None
+        for wallet, return_data in zip(wallets, results)
+    }
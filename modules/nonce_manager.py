@@ -0,0 +1,62 @@
+"""Local nonce manager. The pending nonce is read once per (chain, address) and then handed out locally"""
+import asyncio
+
+from modules.chains import Chain
+from modules.custom_logger import logger
+
+
+class NonceManager:
+    """Nonce counters keyed by (chain name, address)"""
+
+    def __init__(self):
+        self._nonces: dict[tuple[str, str], int] = {}
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+
+    def _lock(self, key: tuple[str, str]) -> asyncio.Lock:
+        if key not in self._locks:
+            self._locks[key] = asyncio.Lock()
+        return self._locks[key]
+
+    async def _sync(self, chain: Chain, address: str) -> None:
+        key = (chain.name, address)
+        if key not in self._nonces:
+            self._nonces[key] = await chain.w3.eth.get_transaction_count(address, "pending")
+            logger.debug(f"NONCE | {address} | {chain.name} pending nonce is {self._nonces[key]}")
+
+    async def sync(self, chain: Chain, address: str) -> None:
+        """Read the pending nonce from the chain if it is not known locally yet
+
+        Args:
+            chain:      blockchain
+            address:    wallet address
+        """
+        async with self._lock((chain.name, address)):
+            await self._sync(chain=chain, address=address)
+
+    async def get_nonce(self, chain: Chain, address: str) -> int:
+        """Reserve the next nonce. Only the first call for (chain, address) goes to the chain
+
+        Args:
+            chain:      blockchain
+            address:    wallet address
+        """
+        key = (chain.name, address)
+        async with self._lock(key):
+            await self._sync(chain=chain, address=address)
+            nonce = self._nonces[key]
+            self._nonces[key] += 1
+            return nonce
+
+    def reset(self, chain: Chain, address: str) -> None:
+        """Forget the local nonce, so the next reservation reads the pending nonce from the chain again.
+        Must be called when a reserved nonce was not used or a transaction was rejected or dropped.
+
+        Args:
+            chain:      blockchain
+            address:    wallet address
+        """
+        if self._nonces.pop((chain.name, address), None) is not None:
+            logger.debug(f"NONCE | {address} | {chain.name} nonce will be resynced")
+
+
+nonce_manager = NonceManager()
@@ -0,0 +1,88 @@
+"""Batched and cached token price oracle
+    Docs: https://min-api.cryptocompare.com/documentation?key=Price&cat=multipleSymbolsPriceEndpoint
+"""
+import asyncio
+import time
+
+import aiohttp
+
+from config import PRICE_API_URL, PRICE_CACHE_TTL, PRICE_MAX_STALENESS
+from modules.custom_logger import logger
+from modules.http_session import session_manager
+from modules.single_flight import SingleFlight
+
+
+class PriceOracle:
+    """$ prices of tokens. All missing symbols are fetched in one multi-symbol request,
+    prices are cached for ttl seconds and concurrent callers share in-flight requests.
+    If a refresh fails, cached prices not older than max_staleness seconds are still served.
+    """
+
+    def __init__(
+        self,
+        base_url: str = PRICE_API_URL,
+        ttl: float = PRICE_CACHE_TTL,
+        max_staleness: float = PRICE_MAX_STALENESS,
+        quote_symbol: str = "USDT",
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self.max_staleness = max_staleness
+        self.quote_symbol = quote_symbol
+        self._prices: dict[str, tuple[float, float]] = {}  # symbol -> (price, fetched at)
+        self._flights = SingleFlight()
+
+    async def _fetch(self, symbols: list[str]) -> None:
+        url = f"{self.base_url}/data/pricemulti"
+        params = {"fsyms": ",".join(symbols), "tsyms": self.quote_symbol}
+        async with session_manager.get().get(url, params=params) as response:
+            response.raise_for_status()
+            data = await response.json()
+
+        fetched_at = time.monotonic()
+        for symbol in symbols:
+            if symbol in data:
+                self._prices[symbol] = (data[symbol][self.quote_symbol], fetched_at)
+
+    def _age(self, symbol: str) -> float:
+        return time.monotonic() - self._prices[symbol][1] if symbol in self._prices else float("inf")
+
+    async def get_prices(self, symbols: list[str] | set[str]) -> dict[str, float]:
+        """Get $ prices of several tokens, fetching all missing or expired ones in one request
+
+        Args:
+            symbols: token symbols (ETH, BNB, etc.)
+        """
+        symbols = set(symbols)
+        expired = [symbol for symbol in symbols if self._age(symbol) >= self.ttl]
+        to_fetch = [symbol for symbol in expired if symbol not in self._flights]
+
+        # Missing symbols are fetched in one request, then symbols fetched by other callers are waited for.
+        # Refreshes are started one by one, so an unexpected error of the fetch leaves no coroutine never awaited
+        refreshes = [lambda: self._flights.run(lambda: self._fetch(to_fetch), *to_fetch)] if to_fetch else []
+        refreshes.append(lambda: self._flights.wait(*expired))
+
+        for refresh in refreshes:
+            try:
+                await refresh()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"PRICE | Could not refresh prices: {e!r}")
+
+        prices = {}
+        for symbol in symbols:
+            if self._age(symbol) > self.max_staleness:
+                raise ValueError(f"No {symbol} price fresher than {self.max_staleness} seconds")
+            prices[symbol] = self._prices[symbol][0]
+
+        return prices
+
+    async def get_price(self, symbol: str) -> float:
+        """Get $ price of a token
+
+        Args:
+            symbol: token symbol (ETH, BNB, etc.)
+        """
+        return (await self.get_prices([symbol]))[symbol]
+
+
+price_oracle = PriceOracle()
@@ -0,0 +1,380 @@
+"""Web3 providers"""
+import asyncio
+import time
+from typing import Any
+
+from aiohttp import ClientResponse
+
+from eth_utils import to_bytes
+from web3 import AsyncHTTPProvider
+from web3._utils.encoding import FriendlyJsonSerde
+from web3.providers.async_base import AsyncBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from config import (
+    RPC_BATCH_MAX_SIZE,
+    RPC_EJECT_AFTER_FAILURES,
+    RPC_EJECT_MAX_SECONDS,
+    RPC_EJECT_SECONDS,
+    RPC_HEDGE_AFTER,
+    RPC_LATENCY_EWMA_ALPHA,
+    RPC_RATE_LIMIT_RETRIES,
+)
+from modules import metrics
+from modules.cassette import cassette
+from modules.custom_logger import logger
+from modules.http_session import session_manager
+from modules.rate_limiter import get_endpoint_limiter
+
+# Results of these methods never change for an endpoint, so they are requested only once
+IMMUTABLE_METHODS = {"eth_chainId", "net_version"}
+# These methods are sent to every healthy endpoint of a pool to propagate transactions faster
+BROADCAST_METHODS = {"eth_sendRawTransaction"}
+
+
+class BatchingAsyncHTTPProvider(AsyncHTTPProvider):
+    """AsyncHTTPProvider that collects independent requests issued in the same event loop tick
+    and sends them as one JSON-RPC batch request over the shared pooled HTTP session.
+    Falls back to single requests if the endpoint does not support batching.
+    Requests wait for the endpoint limiter, and the ones answered with HTTP 429 are retried with backoff.
+    """
+
+    def __init__(self, endpoint_uri: str, request_kwargs: Any = None, max_batch_size: int = RPC_BATCH_MAX_SIZE):
+        super().__init__(endpoint_uri=endpoint_uri, request_kwargs=request_kwargs)
+        self.max_batch_size = max_batch_size
+        self.batching_supported = True
+        self._queue: list[tuple[RPCEndpoint, Any, asyncio.Future]] = []
+        self._batch_tasks: set[asyncio.Task] = set()
+        self._immutable_results: dict[RPCEndpoint, RPCResponse] = {}
+        self.limiter = get_endpoint_limiter(endpoint_uri)
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        if method in self._immutable_results:
+            return self._immutable_results[method]
+
+        if not self.batching_supported:
+            return await self._send_single(method, params)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._queue:
+            loop.call_soon(self._flush)
+        self._queue.append((method, params, future))
+
+        return await future
+
+    def _flush(self) -> None:
+        queue, self._queue = self._queue, []
+        for i in range(0, len(queue), self.max_batch_size):
+            task = asyncio.ensure_future(self._send_batch(queue[i:i + self.max_batch_size]))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    def _store_immutable(self, method: RPCEndpoint, response: RPCResponse) -> RPCResponse:
+        if method in IMMUTABLE_METHODS and "result" in response:
+            self._immutable_results[method] = response
+        return response
+
+    @staticmethod
+    def _retry_delay(response: ClientResponse, attempt: int) -> float:
+        retry_after = response.headers.get("Retry-After", "")
+        return float(retry_after) if retry_after.isdigit() else 2**attempt
+
+    async def _post(self, request_data: bytes, calls: int = 1) -> Any:
+        session = session_manager.get()
+        for attempt in range(RPC_RATE_LIMIT_RETRIES + 1):
+            async with self.limiter.limit(calls):
+                async with session.post(self.endpoint_uri, data=request_data, **self.get_request_kwargs()) as response:
+                    if response.status != 429 or attempt == RPC_RATE_LIMIT_RETRIES:
+                        response.raise_for_status()
+                        raw_response = await response.read()
+                        return self.decode_rpc_response(raw_response)
+                    delay = self._retry_delay(response, attempt)
+
+            self.logger.debug(f"Rate limited by {self.endpoint_uri}, retrying in {delay} seconds")
+            await asyncio.sleep(delay)
+
+    async def _send_single(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        response = await self._post(self.encode_rpc_request(method, params))
+        return self._store_immutable(method, response)
+
+    @staticmethod
+    def _set_result(future: asyncio.Future, result: Any) -> None:
+        """Resolve a caller future unless the caller is gone, e.g. a hedged read that lost the race"""
+        if not future.done():
+            future.set_result(result)
+
+    @staticmethod
+    def _set_exception(future: asyncio.Future, exception: BaseException) -> None:
+        if not future.done():
+            future.set_exception(exception)
+
+    async def _send_batch(self, batch: list[tuple[RPCEndpoint, Any, asyncio.Future]]) -> None:
+        try:
+            if len(batch) == 1:
+                method, params, future = batch[0]
+                self._set_result(future, await self._send_single(method, params))
+                return
+
+            requests = {
+                next(self.request_counter): (method, params, future) for method, params, future in batch
+            }
+            request_data = to_bytes(
+                text=FriendlyJsonSerde().json_encode(
+                    [
+                        {"jsonrpc": "2.0", "method": method, "params": params or [], "id": request_id}
+                        for request_id, (method, params, _) in requests.items()
+                    ]
+                )
+            )
+            responses = await self._post(request_data, calls=len(requests))
+
+            if not isinstance(responses, list):
+                self.logger.debug(f"Batch requests are not supported by {self.endpoint_uri}: {responses}")
+                self.batching_supported = False
+                results = await asyncio.gather(
+                    *[self._send_single(method, params) for method, params, _ in batch], return_exceptions=True
+                )
+                for (_, _, future), result in zip(batch, results):
+                    if isinstance(result, BaseException):
+                        self._set_exception(future, result)
+                    else:
+                        self._set_result(future, result)
+                return
+
+            for response in responses:
+                request = requests.pop(response.get("id"), None)
+                if request is None:  # unknown or null id, the caller it belongs to gets no response below
+                    self.logger.debug(f"Unexpected response in batch from {self.endpoint_uri}: {response}")
+                    continue
+                method, _, future = request
+                self._set_result(future, self._store_immutable(method, response))
+
+            for method, _, future in requests.values():
+                self._set_exception(
+                    future, ValueError(f"No response for {method} in batch from {self.endpoint_uri}")
+                )
+
+        except Exception as e:
+            for _, _, future in batch:
+                self._set_exception(future, e)
+
+
+class _Endpoint:
+    """RPC endpoint state in a pool"""
+
+    def __init__(self, provider: BatchingAsyncHTTPProvider):
+        self.provider = provider
+        self.latency: float | None = None  # EWMA of request latency in seconds
+        self.failures = 0  # consecutive failed requests
+        self.ejected = False
+        self.ejections = 0  # consecutive ejections, every failed probe doubles the ejection time
+        self.probe_at = 0.0
+        self.probe: asyncio.Task | None = None
+
+
+class RpcPoolProvider(AsyncBaseProvider):
+    """Provider over several RPC endpoints of one chain.
+    Requests go to the healthy endpoint with the lowest EWMA latency and fail over to the next one on errors.
+    Reads not answered in hedge_after seconds are also sent to the second best endpoint, the first answer wins.
+    Endpoints failing eject_after_failures times in a row are ejected and probed again after a backoff.
+    Raw transactions are broadcast to all healthy endpoints.
+    Every call is recorded to RPC metrics labeled with the pool name, and to the cassette while one is recorded.
+    Calls are answered from the cassette while one is replayed.
+    """
+
+    def __init__(
+        self,
+        endpoint_uris: list[str],
+        name: str = "",
+        hedge_after: float | None = RPC_HEDGE_AFTER,
+        ewma_alpha: float = RPC_LATENCY_EWMA_ALPHA,
+        eject_after_failures: int = RPC_EJECT_AFTER_FAILURES,
+        eject_seconds: float = RPC_EJECT_SECONDS,
+    ):
+        self.name = name
+        self.endpoints = [_Endpoint(BatchingAsyncHTTPProvider(endpoint_uri)) for endpoint_uri in endpoint_uris]
+        self.hedge_after = hedge_after
+        self.ewma_alpha = ewma_alpha
+        self.eject_after_failures = eject_after_failures
+        self.eject_seconds = eject_seconds
+        self._broadcast_tasks: set[asyncio.Task] = set()
+        self._immutable_requests: dict[RPCEndpoint, asyncio.Task] = {}
+
+    def __str__(self) -> str:
+        return f"RPC pool {[endpoint.provider.endpoint_uri for endpoint in self.endpoints]}"
+
+    def _eject(self, endpoint: _Endpoint) -> None:
+        endpoint.ejected = True
+        endpoint.probe_at = time.monotonic() + min(
+            self.eject_seconds * 2**endpoint.ejections, RPC_EJECT_MAX_SECONDS
+        )
+        endpoint.ejections += 1
+        logger.warning(f"RPC | Endpoint {endpoint.provider.endpoint_uri} is ejected after {endpoint.failures} failures")
+
+    async def _probe(self, endpoint: _Endpoint) -> None:
+        try:
+            await self._request(endpoint, RPCEndpoint("eth_blockNumber"), [])
+        except Exception:
+            self._eject(endpoint)
+        finally:
+            endpoint.probe = None
+
+    def _healthy(self) -> list[_Endpoint]:
+        """Healthy endpoints from the fastest. Probes ejected endpoints whose backoff is over"""
+        now = time.monotonic()
+        for endpoint in self.endpoints:
+            if endpoint.ejected and endpoint.probe is None and now >= endpoint.probe_at:
+                endpoint.probe = asyncio.ensure_future(self._probe(endpoint))
+
+        # Endpoints without measured latency are tried first to get measured
+        return sorted(
+            [endpoint for endpoint in self.endpoints if not endpoint.ejected],
+            key=lambda endpoint: endpoint.latency or 0,
+        )
+
+    def _candidates(self) -> list[_Endpoint]:
+        """Endpoints to try in order. Ejected ones are used only if no endpoint is healthy"""
+        return self._healthy() or sorted(self.endpoints, key=lambda endpoint: endpoint.probe_at)
+
+    def _record_latency(self, endpoint: _Endpoint, latency: float) -> None:
+        endpoint.latency = (
+            latency
+            if endpoint.latency is None
+            else self.ewma_alpha * latency + (1 - self.ewma_alpha) * endpoint.latency
+        )
+
+    async def _request(self, endpoint: _Endpoint, method: RPCEndpoint, params: Any) -> RPCResponse:
+        started = time.monotonic()
+        try:
+            response = await endpoint.provider.make_request(method, params)
+        except asyncio.CancelledError:
+            # A hedged read lost the race, the time it took so far is only a lower bound of the latency.
+            # It may only raise the average, otherwise a slow endpoint cancelled right after the hedge looks fast
+            self._record_latency(endpoint, max(time.monotonic() - started, endpoint.latency or 0))
+            raise
+        except Exception as e:
+            endpoint.failures += 1
+            logger.debug(f"RPC | {method} to {endpoint.provider.endpoint_uri} failed: {e!r}")
+            if not endpoint.ejected and endpoint.failures >= self.eject_after_failures:
+                self._eject(endpoint)
+            raise
+
+        self._record_latency(endpoint, time.monotonic() - started)
+        endpoint.failures = 0
+        if endpoint.ejected:
+            endpoint.ejected = False
+            endpoint.ejections = 0
+            logger.info(f"RPC | Endpoint {endpoint.provider.endpoint_uri} is healthy again")
+        return response
+
+    async def _hedged_request(
+        self, endpoint: _Endpoint, hedge_endpoint: _Endpoint, method: RPCEndpoint, params: Any
+    ) -> RPCResponse:
+        tasks = {asyncio.ensure_future(self._request(endpoint, method, params))}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_after)
+            if not done:
+                logger.debug(f"RPC | Hedging {method} to {hedge_endpoint.provider.endpoint_uri}")
+                tasks.add(asyncio.ensure_future(self._request(hedge_endpoint, method, params)))
+
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _read(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        candidates = self._candidates()
+        error = None
+        while candidates:
+            endpoint = candidates.pop(0)
+            try:
+                if self.hedge_after is not None and candidates:
+                    return await self._hedged_request(endpoint, candidates[0], method, params)
+                return await self._request(endpoint, method, params)
+            except Exception as e:
+                error = e
+
+        raise error
+
+    async def _broadcast(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        tasks = {asyncio.ensure_future(self._request(endpoint, method, params)) for endpoint in self._candidates()}
+        responses = []
+        error = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    error = task.exception()
+                elif "result" in task.result():
+                    # The rest of endpoints keep propagating the transaction in background
+                    for pending in tasks:
+                        self._broadcast_tasks.add(pending)
+                        pending.add_done_callback(self._broadcast_tasks.discard)
+                        pending.add_done_callback(lambda finished: finished.cancelled() or finished.exception())
+                    return task.result()
+                else:
+                    responses.append(task.result())
+
+        if responses:
+            return responses[0]  # all endpoints rejected the transaction
+        raise error
+
+    async def _read_immutable(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        """Request a method with a result fixed for the chain once, concurrent callers share the request"""
+        if method not in self._immutable_requests:
+            self._immutable_requests[method] = asyncio.ensure_future(self._read(method, params))
+
+        request = self._immutable_requests[method]
+        try:
+            response = await asyncio.shield(request)
+        except Exception:
+            if self._immutable_requests.get(method) is request:
+                del self._immutable_requests[method]
+            raise
+
+        if "result" not in response and self._immutable_requests.get(method) is request:
+            del self._immutable_requests[method]
+        return response
+
+    async def _route(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        if method in BROADCAST_METHODS:
+            return await self._broadcast(method, params)
+        if method in IMMUTABLE_METHODS:
+            return await self._read_immutable(method, params)
+        return await self._read(method, params)
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        started = time.monotonic()
+        metrics.rpc_in_flight.inc(self.name)
+        try:
+            if cassette.replaying:
+                response = await cassette.play_rpc(self.name, method, params)
+            else:
+                response = await self._route(method, params)
+        except Exception:
+            metrics.rpc_errors.inc(self.name, method)
+            raise
+        finally:
+            metrics.rpc_in_flight.dec(self.name)
+            metrics.rpc_latency.observe(self.name, method, value=time.monotonic() - started)
+
+        if cassette.recording:
+            cassette.record_rpc(self.name, method, params, response, time.monotonic() - started)
+
+        if "error" in response:
+            metrics.rpc_errors.inc(self.name, method)
+        return response
+
+    async def is_connected(self) -> bool:
+        for endpoint in self._candidates():
+            if await endpoint.provider.is_connected():
+                return True
+        return False
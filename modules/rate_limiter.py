@@ -0,0 +1,73 @@
+"""Per-endpoint request limits"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from config import RPC_ENDPOINT_LIMITS, RPC_MAX_IN_FLIGHT, RPC_REQUESTS_PER_SECOND
+
+
+class TokenBucket:
+    """Token bucket refilled with rate tokens per second up to capacity.
+    Callers wait in FIFO order until the tokens they took are refilled, so a burst is spread over time.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """Take tokens, waiting until the bucket is not in debt
+
+        Args:
+            tokens:     number of tokens to take, can be larger than capacity
+        """
+        async with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            if self._tokens < 0:
+                await asyncio.sleep(-self._tokens / self.rate)
+
+
+class EndpointLimiter:
+    """Limits number of simultaneous HTTP requests and JSON-RPC calls per second sent to one endpoint"""
+
+    def __init__(self, max_in_flight: int = RPC_MAX_IN_FLIGHT, requests_per_second: float = RPC_REQUESTS_PER_SECOND):
+        self.max_in_flight = max_in_flight
+        self.requests_per_second = requests_per_second
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._bucket = TokenBucket(rate=requests_per_second)
+
+    @asynccontextmanager
+    async def limit(self, calls: int = 1) -> AsyncIterator[None]:
+        """Hold an in-flight slot for the request
+
+        Args:
+            calls:      number of JSON-RPC calls in the request, a batch request counts every call
+        """
+        await self._bucket.acquire(calls)
+        async with self._semaphore:
+            yield
+
+
+_limiters: dict[str, EndpointLimiter] = {}
+
+
+def get_endpoint_limiter(endpoint_uri: str) -> EndpointLimiter:
+    """Get the limiter shared by all providers of an endpoint. Limits can be set per endpoint in config"""
+    if endpoint_uri not in _limiters:
+        max_in_flight, requests_per_second = RPC_ENDPOINT_LIMITS.get(
+            endpoint_uri, (RPC_MAX_IN_FLIGHT, RPC_REQUESTS_PER_SECOND)
+        )
+        _limiters[endpoint_uri] = EndpointLimiter(
+            max_in_flight=max_in_flight, requests_per_second=requests_per_second
+        )
+    return _limiters[endpoint_uri]
@@ -0,0 +1,124 @@
+"""Multi-hop route planner over the Stargate chain graph"""
+import asyncio
+import heapq
+
+from modules.chains import Chain
+from modules.custom_logger import logger
+from modules.fee_quotes import fee_quote_service
+from modules.gas_price import get_gas_price_service
+from modules.price_oracle import price_oracle
+from modules.routes import Route, stargate_routes
+
+CHEAPEST = "cheapest"
+FASTEST = "fastest"
+
+# Expected seconds from sending a swap until tokens arrive, by source chain.
+# Mostly the source chain confirmations LayerZero waits for.
+DELIVERY_TIMES = {
+    "POLYGON": 1200,
+    "FANTOM": 120,
+    "AVALANCHE": 60,
+    "BSC": 120,
+    "ARBITRUM": 120,
+    "OPTIMISM": 120,
+    "BASE": 120,
+}
+
+
+class RoutePlanner:
+    """Finds the cheapest or the fastest sequence of legs between two chains.
+    Chains are graph nodes and direct Stargate routes are weighted edges:
+    $ cost of LayerZero fee and gas for the cheapest plans, expected delivery time for the fastest ones.
+    Edge weights and plans are computed once per run and cached.
+    """
+
+    def __init__(self, routes: list[Route], delivery_times: dict[str, float] = DELIVERY_TIMES):
+        self.routes = routes
+        self.delivery_times = delivery_times
+        self._edges: dict[str, list[Route]] = {}
+        for route in routes:
+            self._edges.setdefault(route.from_chain.name, []).append(route)
+
+        self._weights: dict[str, dict[str, float]] = {}
+        self._weights_lock = asyncio.Lock()
+        self._plans: dict[tuple[str, str, str], list[Route]] = {}
+
+    async def _route_cost(self, route: Route, native_prices: dict[str, float]) -> float:
+        fee, gas_price = await asyncio.gather(
+            fee_quote_service.get(from_chain=route.from_chain, destination_chain_id=route.destination_chain_id),
+            get_gas_price_service(route.from_chain).get(),
+        )
+        native_cost = (fee + route.gas * gas_price) / 10**route.from_chain.native_token_decimals
+        return native_cost * native_prices[route.from_chain.native_asset_symbol]
+
+    async def _get_weights(self, objective: str) -> dict[str, float]:
+        async with self._weights_lock:
+            if objective not in self._weights:
+                if objective == CHEAPEST:
+                    native_prices = await price_oracle.get_prices(
+                        {route.from_chain.native_asset_symbol for route in self.routes}
+                    )
+                    costs = await asyncio.gather(
+                        *[self._route_cost(route=route, native_prices=native_prices) for route in self.routes]
+                    )
+                    self._weights[objective] = {route.code: cost for route, cost in zip(self.routes, costs)}
+                elif objective == FASTEST:
+                    self._weights[objective] = {
+                        route.code: self.delivery_times[route.from_chain.name] for route in self.routes
+                    }
+                else:
+                    raise ValueError(f"Unknown planning objective {objective}")
+
+            return self._weights[objective]
+
+    async def plan(self, from_chain: Chain, to_chain: Chain, objective: str = CHEAPEST) -> list[Route]:
+        """Get the best sequence of legs from one chain to another
+
+        Args:
+            from_chain:     sending chain
+            to_chain:       destination chain
+            objective:      "cheapest" to minimize $ cost or "fastest" to minimize delivery time
+        """
+        key = (from_chain.name, to_chain.name, objective)
+        if key in self._plans:
+            return self._plans[key]
+
+        weights = await self._get_weights(objective)
+
+        # Dijkstra over chain names
+        best = {from_chain.name: 0.0}
+        previous: dict[str, Route] = {}
+        queue = [(0.0, from_chain.name)]
+        while queue:
+            total, chain_name = heapq.heappop(queue)
+            if chain_name == to_chain.name:
+                break
+            if total > best[chain_name]:
+                continue
+            for route in self._edges.get(chain_name, []):
+                candidate = total + weights[route.code]
+                if candidate < best.get(route.to_chain.name, float("inf")):
+                    best[route.to_chain.name] = candidate
+                    previous[route.to_chain.name] = route
+                    heapq.heappush(queue, (candidate, route.to_chain.name))
+
+        if to_chain.name not in previous:
+            raise ValueError(f"No Stargate path from {from_chain.name} to {to_chain.name}")
+
+        legs = []
+        chain_name = to_chain.name
+        while chain_name != from_chain.name:
+            legs.append(previous[chain_name])
+            chain_name = previous[chain_name].from_chain.name
+        legs.reverse()
+
+        logger.info(
+            f"PLAN | {objective.upper()} path from {from_chain.name} to {to_chain.name}: "
+            f"{' -> '.join([legs[0].from_chain.name] + [leg.to_chain.name for leg in legs])}, "
+            f"weight {round(best[to_chain.name], 2)}"
+        )
+        self._plans[key] = legs
+        return legs
+
+
+route_planner = RoutePlanner(routes=list(stargate_routes.values()))
@@ -0,0 +1,66 @@
+"""Route registry. All routes are built once from Chain and Token definitions"""
+from web3.contract import AsyncContract
+
+from modules.chains import Chain, all_chains
+
+
+class Route:
+    """Descriptor of a route between two chains
+
+    Args:
+        from_chain:     sending chain
+        to_chain:       destination chain
+    """
+
+    def __init__(self, from_chain: Chain, to_chain: Chain):
+        self.from_chain = from_chain
+        self.to_chain = to_chain
+        self.code = f"{from_chain.route_code}{to_chain.route_code}"  # short CLI code, e.g. "pa"
+        self.name = f"{from_chain.name.lower()}-{to_chain.name.lower()}"  # e.g. "polygon-avalanche"
+        self.token = from_chain.bridge_token
+        self.destination_chain_id = to_chain.layer_zero_chain_id
+        self.source_pool_id = from_chain.bridge_token.stargate_pool_id
+        self.dest_pool_id = to_chain.bridge_token.stargate_pool_id
+        self.gas = from_chain.gas
+
+    @property
+    def token_contract(self) -> AsyncContract:
+        return self.from_chain.bridge_token_contract
+
+    def __repr__(self) -> str:
+        return f"Route({self.name})"
+
+
+def _is_stargate_route(from_chain: Chain, to_chain: Chain) -> bool:
+    return (
+        from_chain is not to_chain
+        and (from_chain.stargate_routes is None or to_chain.name in from_chain.stargate_routes)
+        and (to_chain.stargate_routes is None or from_chain.name in to_chain.stargate_routes)
+    )
+
+
+def _is_bungee_route(from_chain: Chain, to_chain: Chain) -> bool:
+    return from_chain is not to_chain and from_chain.bungee_refuel_supported and to_chain.bungee_refuel_supported
+
+
+# Route code -> route, e.g. "pa" -> polygon-avalanche
+stargate_routes: dict[str, Route] = {}
+bungee_routes: dict[str, Route] = {}
+# All chain pairs, including ones without a direct route, e.g. "fbase" -> fantom-base
+routes_by_code: dict[str, Route] = {}
+# (source chain name, destination chain name) -> route
+routes_by_chains: dict[tuple[str, str], Route] = {}
+
+for _from_chain in all_chains:
+    for _to_chain in all_chains:
+        if _from_chain is _to_chain:
+            continue
+
+        _route = Route(from_chain=_from_chain, to_chain=_to_chain)
+        assert _route.code not in routes_by_code, f"Route code {_route.code} is ambiguous"
+        routes_by_code[_route.code] = _route
+        routes_by_chains[(_from_chain.name, _to_chain.name)] = _route
+        if _is_stargate_route(_from_chain, _to_chain):
+            stargate_routes[_route.code] = _route
+        if _is_bungee_route(_from_chain, _to_chain):
+            bungee_routes[_route.code] = _route
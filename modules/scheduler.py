@@ -0,0 +1,100 @@
+"""Central scheduler of delayed wallet jobs"""
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Awaitable, Callable
+
+from config import SCHEDULER_WORKERS
+from modules.custom_logger import logger
+
+Job = Callable[[], Awaitable[None]]
+
+
+class Scheduler:
+    """Heap of (due time, job) entries dispatched to a bounded pool of worker tasks.
+    Waiting jobs are heap entries rather than sleeping coroutines, so tens of thousands of wallets cost
+    O(log n) per scheduled job, and at most `workers` jobs run at once. Jobs may schedule follow-up jobs.
+
+    Args:
+        workers:    max number of jobs running at once
+    """
+
+    def __init__(self, workers: int = SCHEDULER_WORKERS):
+        self.workers = workers
+        self._heap: list[tuple[float, int, str, Job]] = []
+        self._counter = itertools.count()  # keeps jobs due at the same time in scheduling order
+        self._ready: asyncio.Queue[tuple[str, Job]] | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._idle: asyncio.Event | None = None
+        self._unfinished = 0  # scheduled jobs that are not done yet
+        self.running = 0
+
+    @property
+    def waiting(self) -> int:
+        """Number of jobs that are not due yet or wait for a free worker"""
+        return len(self._heap) + (self._ready.qsize() if self._ready is not None else 0)
+
+    def schedule(self, key: str, job: Job, delay: float = 0) -> None:
+        """Run a job after a delay
+
+        Args:
+            key:    job owner shown in logs, e.g. wallet address
+            job:    coroutine function to run
+            delay:  seconds to wait before the job is due
+        """
+        entry = (time.monotonic() + delay, next(self._counter), key, job)
+        heapq.heappush(self._heap, entry)
+        self._unfinished += 1
+        if self._heap[0] is entry and self._wakeup is not None:  # the dispatcher sleeps until a later due time
+            self._wakeup.set()
+
+    async def _dispatch(self) -> None:
+        while True:
+            if not self._heap:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            due_in = self._heap[0][0] - time.monotonic()
+            if due_in > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=due_in)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, key, job = heapq.heappop(self._heap)
+            self._ready.put_nowait((key, job))
+
+    async def _work(self) -> None:
+        while True:
+            key, job = await self._ready.get()
+            self.running += 1
+            try:
+                await job()
+            except Exception as e:
+                logger.error(f"SCHEDULER | {key} | Job failed: {e!r}")
+            finally:
+                self.running -= 1
+                self._unfinished -= 1
+                if not self._unfinished:
+                    self._idle.set()
+
+    async def run(self) -> None:
+        """Run scheduled jobs until all of them, follow-up ones included, are done"""
+        self._ready = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        if not self._unfinished:
+            return
+
+        tasks = [asyncio.create_task(self._dispatch())]
+        tasks += [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        try:
+            await self._idle.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
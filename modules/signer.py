@@ -0,0 +1,74 @@
+"""Wallet accounts and transaction signing off the event loop"""
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from eth_account import Account
+from eth_account.signers.local import LocalAccount
+from hexbytes import HexBytes
+
+from config import SIGNER_MAX_WORKERS, SIGNER_USE_PROCESSES
+
+
+def _sign_transaction(transaction: dict, private_key: str) -> HexBytes:
+    """Sign a transaction in a worker. Module level to be picklable for process workers"""
+    return Account.sign_transaction(transaction, private_key).rawTransaction
+
+
+class Signer:
+    """Accounts derived once per private key and secp256k1 signing in a bounded worker pool,
+    so CPU-bound work of thousands of wallets does not stall I/O of the event loop.
+    Thread workers are used by default, process workers can be enabled in config.
+    """
+
+    def __init__(self, max_workers: int = SIGNER_MAX_WORKERS, use_processes: bool = SIGNER_USE_PROCESSES):
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self._accounts: dict[str, LocalAccount] = {}
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            executor_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+            self._executor = executor_class(max_workers=self.max_workers)
+        return self._executor
+
+    def account(self, private_key: str) -> LocalAccount:
+        """Get the account of a private key, derived on first use"""
+        if private_key not in self._accounts:
+            self._accounts[private_key] = Account.from_key(private_key)
+        return self._accounts[private_key]
+
+    def address(self, private_key: str) -> str:
+        """Get the public address of a private key"""
+        return self.account(private_key).address
+
+    async def load(self, private_keys: list[str]) -> None:
+        """Derive accounts of all private keys in workers"""
+        new_keys = [private_key for private_key in dict.fromkeys(private_keys) if private_key not in self._accounts]
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers) if self.use_processes else self._get_executor()
+        accounts = await asyncio.gather(
+            *[loop.run_in_executor(executor, Account.from_key, private_key) for private_key in new_keys]
+        )
+        if self.use_processes:  # derived accounts are kept in this process, so threads are used for loading
+            executor.shutdown()
+        self._accounts.update(zip(new_keys, accounts))
+
+    async def sign_transaction(self, transaction: dict, private_key: str) -> HexBytes:
+        """Sign a transaction in a worker. Returns the raw signed transaction
+
+        Args:
+            transaction:    transaction dict with nonce, gas and chainId filled
+            private_key:    wallet private key
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), _sign_transaction, transaction, private_key)
+
+    def close(self) -> None:
+        """Shut the worker pool down"""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+signer = Signer()
@@ -0,0 +1,75 @@
+"""In-flight calls shared by concurrent callers"""
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Abandoned(Exception):
+    """The caller running the call was cancelled"""
+
+
+class SingleFlight:
+    """Calls keyed by what they fetch. The first caller of a key runs the call inline, so its JSON-RPC requests
+    join the batch of its event loop tick, and other callers of the key wait for its result instead of sending
+    their own requests. If the first caller is cancelled, one of the waiters runs the call again.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def run(self, call: Callable[[], Awaitable[T]], *keys: Hashable) -> T:
+        """Run a call as the in-flight call of all keys
+
+        Args:
+            call:   coroutine function to run
+            keys:   keys the call fetches
+        """
+        pending = asyncio.get_running_loop().create_future()
+        for key in keys:
+            self._calls[key] = pending
+
+        try:
+            result = await call()
+        except BaseException as e:
+            # Waiters get the error, or run the call again if this caller was cancelled
+            pending.set_exception(_Abandoned() if isinstance(e, asyncio.CancelledError) else e)
+            pending.exception()  # a call without waiters does not log its error as never retrieved
+            raise
+        else:
+            pending.set_result(result)
+        finally:
+            for key in keys:
+                if self._calls.get(key) is pending:
+                    del self._calls[key]
+
+        return result
+
+    async def wait(self, *keys: Hashable) -> None:
+        """Wait for the in-flight calls of keys to end. Calls of cancelled callers are skipped
+
+        Args:
+            keys:   keys to wait for, keys without an in-flight call are skipped
+        """
+        calls = {self._calls[key] for key in keys if key in self._calls}
+        for result in await asyncio.gather(*[asyncio.shield(call) for call in calls], return_exceptions=True):
+            if isinstance(result, Exception) and not isinstance(result, _Abandoned):
+                raise result
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """Get the result of the in-flight call of a key, or run the call if there is none
+
+        Args:
+            key:    key the call fetches
+            call:   coroutine function to run
+        """
+        while (pending := self._calls.get(key)) is not None:
+            try:
+                return await asyncio.shield(pending)
+            except _Abandoned:
+                continue
+
+        return await self.run(call, key)
@@ -0,0 +1,93 @@
+"""Immutable token metadata registry. Decimals and symbols are fetched at most once per process"""
+from typing import Awaitable, Callable
+
+from web3 import AsyncWeb3
+from web3.contract import AsyncContract
+
+from modules.chains import Chain, all_chains
+from modules.single_flight import SingleFlight
+from modules.tokens import token_decimals, usdc, usdt
+
+NATIVE_ASSET = "native"  # registry address key of the chain native asset
+
+
+class TokenRegistry:
+    """Token decimals and symbols keyed by (chain name, contract address)"""
+
+    def __init__(self):
+        self._chains: list[Chain] = []
+        self._chain_names: dict[AsyncWeb3, str] = {}
+        self._decimals: dict[tuple[str, str], int] = {}
+        self._symbols: dict[tuple[str, str], str] = {}
+        self._flights = SingleFlight()
+
+    def register_chain(self, chain: Chain) -> None:
+        """Register chain and pre-seed metadata of its native asset and known tokens
+
+        Args:
+            chain: blockchain to register
+        """
+        self._chains.append(chain)
+
+        self._decimals[(chain.name, NATIVE_ASSET)] = chain.native_token_decimals
+        self._symbols[(chain.name, NATIVE_ASSET)] = chain.native_asset_symbol
+
+        for token_address, token in ((chain.usdc_address, usdc), (chain.usdt_address, usdt)):
+            if token_address is None:
+                continue
+            self._symbols[(chain.name, token_address.lower())] = token.name
+            if decimals := token_decimals.get(token_address.lower()):
+                self._decimals[(chain.name, token_address.lower())] = decimals
+
+    def _chain_name(self, w3: AsyncWeb3) -> str:
+        if w3 not in self._chain_names:
+            # Chains create their web3 instances on first use
+            self._chain_names.update({chain.w3: chain.name for chain in self._chains if "w3" in vars(chain)})
+            if w3 not in self._chain_names:
+                raise ValueError(f"Web3 instance with {w3.provider} belongs to no registered chain")
+        return self._chain_names[w3]
+
+    def _key(self, token_contract: AsyncContract) -> tuple[str, str]:
+        return self._chain_name(token_contract.w3), token_contract.address.lower()
+
+    def cached_decimals(self, token_contract: AsyncContract) -> int | None:
+        """Get token decimals without touching the network. None if not known yet"""
+        return self._decimals.get(self._key(token_contract))
+
+    async def get_decimals(self, token_contract: AsyncContract) -> int:
+        """Get token decimals, fetching them once if not known yet
+
+        Args:
+            token_contract: token contract to check
+        """
+        key = self._key(token_contract)
+        if (decimals := self._decimals.get(key)) is not None:
+            return decimals
+
+        return await self._fetch("decimals", key, self._decimals, token_contract.functions.decimals().call)
+
+    async def get_symbol(self, token_contract: AsyncContract) -> str:
+        """Get token symbol, fetching it once if not known yet
+
+        Args:
+            token_contract: token contract to check
+        """
+        key = self._key(token_contract)
+        if (symbol := self._symbols.get(key)) is not None:
+            return symbol
+
+        return await self._fetch("symbol", key, self._symbols, token_contract.functions.symbol().call)
+
+    async def _fetch(
+        self, field: str, key: tuple[str, str], storage: dict, call: Callable[[], Awaitable]
+    ) -> int | str:
+        """Share one in-flight request between concurrent callers and store its result"""
+        value = await self._flights.do((field, *key), call)
+        storage[key] = value
+        return value
+
+
+token_registry = TokenRegistry()
+
+for _chain in all_chains:
+    token_registry.register_chain(_chain)
@@ -58,3 +58,17 @@ token_addresses = {
     usdc.optimism_adress.lower(): "OPTIMISM",
     usdc.base_address.lower(): "BASE"
 }
+
+# Token decimals are immutable, so they are known upfront and never have to be fetched from the chain
+token_decimals = {
+    usdc.polygon_address.lower(): 6,
+    usdc.fantom_address.lower(): 6,
+    usdc.avalanche_address.lower(): 6,
+    usdc.arbitrum_address.lower(): 6,
+    usdc.optimism_adress.lower(): 6,
+    usdc.base_address.lower(): 6,
+    usdt.polygon_address.lower(): 6,
+    usdt.avalanche_address.lower(): 6,
+    usdt.bsc_address.lower(): 18,
+    usdt.arbitrum_address.lower(): 6,
+}
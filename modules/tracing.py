@@ -0,0 +1,129 @@
+"""Span tracing of bridge leg stages exported as JSON lines"""
+import contextvars
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Iterator, TypeVar
+
+from prettytable import PrettyTable
+
+from config import TRACE_PATH
+
+T = TypeVar("T")
+
+# Tags of the leg running in the current task, copied to every span the leg records
+_leg_tags: contextvars.ContextVar[dict] = contextvars.ContextVar("leg_tags", default={})
+
+
+class Tracer:
+    """Records a span per leg stage with wallet, chain and route tags of the current leg.
+    Every finished span is appended to a JSON lines file. Tracing is off if path is None.
+    """
+
+    def __init__(self, path: str | None = TRACE_PATH):
+        self.path = path
+        self._file = None
+
+    def set_leg(self, wallet: str, chain: str, route: str) -> None:
+        """Tag spans recorded later in the current task with a leg
+
+        Args:
+            wallet:     wallet public address
+            chain:      sending chain name
+            route:      route name, e.g. polygon-avalanche
+        """
+        _leg_tags.set({"wallet": wallet, "chain": chain, "route": route})
+
+    def _export(self, span: dict) -> None:
+        if self._file is None:
+            self._file = open(self.path, "a")
+        self._file.write(json.dumps(span) + "\n")
+        self._file.flush()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time a stage of the current leg
+
+        Args:
+            name:   stage name, e.g. receipt_wait
+        """
+        if self.path is None:
+            yield
+            return
+
+        started_at, started = time.time(), time.monotonic()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = repr(e)
+            raise
+        finally:
+            self._export(
+                {
+                    "name": name,
+                    **_leg_tags.get(),
+                    "start": started_at,
+                    "duration": time.monotonic() - started,
+                    "error": error,
+                }
+            )
+
+    async def traced(self, name: str, awaitable: Awaitable[T]) -> T:
+        """Await in a span. Used for stages running concurrently inside asyncio.gather"""
+        with self.span(name):
+            return await awaitable
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))]
+
+
+def _add_rows(table: PrettyTable, groups: dict[tuple, list[float]]) -> None:
+    for key, durations in sorted(groups.items()):
+        durations.sort()
+        table.add_row(
+            [
+                *key,
+                len(durations),
+                round(_percentile(durations, 50), 2),
+                round(_percentile(durations, 95), 2),
+                round(durations[-1], 2),
+            ]
+        )
+
+
+def report(path: str = TRACE_PATH) -> str:
+    """Get p50, p95 and max seconds of every stage overall and per route from exported spans"""
+    if path is None or not os.path.exists(path):
+        return f"No spans found at {path}"
+
+    by_stage: dict[tuple, list[float]] = {}
+    by_route: dict[tuple, list[float]] = {}
+    with open(path) as file:
+        for line in file:
+            try:
+                span = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            by_stage.setdefault((span["name"],), []).append(span["duration"])
+            by_route.setdefault((span.get("route", "-"), span["name"]), []).append(span["duration"])
+
+    stage_table = PrettyTable()
+    stage_table.field_names = ["Stage", "Spans", "p50 s", "p95 s", "Max s"]
+    _add_rows(stage_table, by_stage)
+
+    route_table = PrettyTable()
+    route_table.field_names = ["Route", "Stage", "Spans", "p50 s", "p95 s", "Max s"]
+    _add_rows(route_table, by_route)
+
+    return f"{stage_table}\n{route_table}"
+
+
+tracer = Tracer()
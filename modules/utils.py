@@ -1,11 +1,15 @@
 """Helper functions"""
-import aiohttp
-from eth_account import Account
 from hexbytes import HexBytes
 from loguru import logger
 from web3.contract import AsyncContract
+from web3.exceptions import TimeExhausted
 
 from modules.chains import Chain
+from modules.nonce_manager import nonce_manager
+from modules.price_oracle import price_oracle
+from modules.signer import signer
+from modules.token_registry import token_registry
+from modules.tracing import tracer
 
 
 async def get_token_decimals(token_contract: AsyncContract) -> int:
@@ -14,7 +18,7 @@ async def get_token_decimals(token_contract: AsyncContract) -> int:
     Args:
         token_contract: token contract to check
     """
-    return await token_contract.functions.decimals().call()
+    return await token_registry.get_decimals(token_contract=token_contract)
 
 
 async def get_token_symbol(token_contract: AsyncContract) -> str:
@@ -23,7 +27,7 @@ async def get_token_symbol(token_contract: AsyncContract) -> str:
     Args:
         token_contract: token contract to check
     """
-    return await token_contract.functions.symbol().call()
+    return await token_registry.get_symbol(token_contract=token_contract)
 
 
 def get_min_amount_to_swap(amount_to_swap: int, slippage: float = 0.005) -> int:
@@ -55,34 +59,56 @@ async def get_correct_amount_and_min_amount(
 
 
 def wallet_public_address(wallet_private_key: str) -> str:
-    """Function for getting public wallet adress from private key"""
-    return Account.from_key(wallet_private_key).address
+    """Function for getting public wallet adress from private key. Accounts are derived once by the signer"""
+    return signer.address(wallet_private_key)
 
 
 async def get_token_price(token_symbol: str) -> float:
-    """Function for fetching token $ price"""
-    url = f"https://min-api.cryptocompare.com/data/price?fsym={token_symbol}&tsyms=USDT"
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            response.raise_for_status()
-            return (await response.json())["USDT"]
+    """Function for fetching token $ price. Prices are cached by the price oracle"""
+    return await price_oracle.get_price(symbol=token_symbol)
 
 
-async def _send_transaction(address: str, from_chain: Chain, transaction: dict, private_key: str) -> HexBytes:
-    """Signing and sending transaction function"""
-    signed_transaction = from_chain.w3.eth.account.sign_transaction(transaction, private_key)
+async def _submit_transaction(address: str, from_chain: Chain, transaction: dict, private_key: str) -> str:
+    """Signing and sending transaction function. Returns as soon as the node accepts the transaction"""
+    with tracer.span("sign"):
+        raw_transaction = await signer.sign_transaction(transaction=transaction, private_key=private_key)
     logger.info(f"SIGNING | {address} | Transaction signed")
     try:
-        transaction_hash = await from_chain.w3.eth.send_raw_transaction(signed_transaction.rawTransaction)
+        with tracer.span("send"):
+            transaction_hash = await from_chain.w3.eth.send_raw_transaction(raw_transaction)
     except Exception as e:
         logger.error(f"SENDING | {address} | Problem sending transaction. Probably wallet balance is too low. {e}")
+        nonce_manager.reset(chain=from_chain, address=address)
+        raise
     hex_tr = transaction_hash.hex()
     logger.info(f"SENDING | {address} | Transaction: https://{from_chain.explorer}/tx/{hex_tr}")
-    receipt = await from_chain.w3.eth.wait_for_transaction_receipt(transaction_hash)
+
+    return hex_tr
+
+
+async def _wait_for_transaction(address: str, from_chain: Chain, hex_tr: str) -> bool:
+    """Waiting for transaction receipt function. Returns whether the transaction succeeded"""
+    try:
+        with tracer.span("receipt_wait"):
+            receipt = await from_chain.w3.eth.wait_for_transaction_receipt(HexBytes(hex_tr))
+    except TimeExhausted:
+        logger.error(f"SENDING | {address} | Transaction {hex_tr} was not mined. It could have been dropped")
+        nonce_manager.reset(chain=from_chain, address=address)
+        raise
 
     if receipt.status == 1:
         logger.success(f"SENDING | {address} | Transaction succeeded")
     else:
         logger.error(f"SENDING | {address} | Transaction failed")
 
+    return receipt.status == 1
+
+
+async def _send_transaction(address: str, from_chain: Chain, transaction: dict, private_key: str) -> str:
+    """Signing and sending transaction function. Waits for the transaction receipt"""
+    hex_tr = await _submit_transaction(
+        address=address, from_chain=from_chain, transaction=transaction, private_key=private_key
+    )
+    await _wait_for_transaction(address=address, from_chain=from_chain, hex_tr=hex_tr)
+
     return hex_tr